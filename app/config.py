@@ -1 +1,84 @@
 # Settings (CORS, env vars)
+import os
+
+# Pagination
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+# Uploads
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
+
+# Thumbnail processing
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+IMAGE_QUEUE_LIMIT = int(os.getenv("IMAGE_QUEUE_LIMIT", "8"))
+THUMBNAIL_WIDTHS = tuple(int(w) for w in os.getenv("THUMBNAIL_WIDTHS", "1600,640,160").split(","))
+THUMBNAIL_DEFAULT_WIDTH = int(os.getenv("THUMBNAIL_DEFAULT_WIDTH", "640"))
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "webp").lower()
+# Partial uploads: outside the /static mount, but on the same filesystem as UPLOAD_DIR so
+# finished files can be renamed into place
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR", os.path.normpath(UPLOAD_DIR) + "-tmp")
+MAX_IMAGE_UPLOAD_SIZE = int(os.getenv("MAX_IMAGE_UPLOAD_SIZE", "10000000"))  # 10MB
+MAX_PDF_UPLOAD_SIZE = int(os.getenv("MAX_PDF_UPLOAD_SIZE", "5000000"))  # 5MB, same as MAX_PDF_SIZE in models/teacher.py
+
+# Document cache
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+# Password hashing
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+
+# Bulk import
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+IMPORT_MAX_LINE_BYTES = int(os.getenv("IMPORT_MAX_LINE_BYTES", "1000000"))
+
+# Streaming export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+
+# MongoDB
+# Credentials come from the environment only; never commit a connection string
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "liahub_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0")) or None  # 0 = never close idle connections
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "20000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0")) or None  # 0 = wait forever
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+MONGO_WARMUP_CONNECTIONS = int(os.getenv("MONGO_WARMUP_CONNECTIONS", str(max(1, MONGO_MIN_POOL_SIZE))))
+
+# Instrumentation
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))  # 0 = slow-request log disabled
+
+# Response compression (brotli is used when the optional `Brotli` package is installed)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# Enrollment counters (student_count increments are batched; this bounds their staleness)
+ENROLLMENT_FLUSH_SECONDS = float(os.getenv("ENROLLMENT_FLUSH_SECONDS", "5"))
+
+# Request coalescing (single-flight reads); a shared query taking longer than this fails with 504
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "10"))
+
+# Change feed (cache invalidation across workers + /events SSE); polling is the fallback
+# when the deployment has no change streams (standalone mongod, in-memory stand-ins)
+CHANGE_FEED_ENABLED = os.getenv("CHANGE_FEED_ENABLED", "1") == "1"
+CHANGE_POLL_SECONDS = float(os.getenv("CHANGE_POLL_SECONDS", "2"))
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "100"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+# Catalog facets: incremental counts are re-derived from the collection this often
+FACETS_RECOMPUTE_SECONDS = float(os.getenv("FACETS_RECOMPUTE_SECONDS", "300"))
+
+# Quiz grading
+MAX_QUIZ_SUBMISSIONS = int(os.getenv("MAX_QUIZ_SUBMISSIONS", "500"))  # per batch request
+ANSWER_KEY_MAX_COURSES = int(os.getenv("ANSWER_KEY_MAX_COURSES", "1000"))
+
+# Serving (app/serve.py)
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))  # 0 = one worker per available core
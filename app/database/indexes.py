@@ -0,0 +1,79 @@
+# Declarative index registry, applied idempotently at app startup
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+# collection name -> indexes it must have
+INDEXES = {
+    "users": [
+        IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+    ],
+    "students": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "teacher_courses": [
+        # keyset pagination on GET /teacher_courses/
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"),
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING)], name="category_created_at"),
+        IndexModel(
+            [("status", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING)],
+            name="status_category_created_at",
+        ),
+        # incremental exports (GET /teacher_courses/export?since=)
+        IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_at_id"),
+        # GET /teacher_courses/search; a collection can only have one text index
+        IndexModel(
+            [
+                ("title", TEXT),
+                ("description", TEXT),
+                ("modules.title", TEXT),
+                ("modules.lessons.title", TEXT),
+                ("modules.lessons.summary", TEXT),
+            ],
+            weights={
+                "title": 10,
+                "modules.title": 5,
+                "modules.lessons.title": 3,
+                "description": 2,
+                "modules.lessons.summary": 1,
+            },
+            default_language="english",
+            name="course_text",
+        ),
+    ],
+    "enrollments": [
+        IndexModel([("student_id", ASCENDING), ("course_id", ASCENDING)], unique=True, name="student_course_unique"),
+        IndexModel([("course_id", ASCENDING)], name="course_id"),
+    ],
+    "quiz_attempts": [
+        IndexModel(
+            [("course_id", ASCENDING), ("module_id", ASCENDING), ("student_id", ASCENDING), ("submitted_at", DESCENDING)],
+            name="course_module_student_submitted_at",
+        ),
+    ],
+    "course": [
+        # keyset pagination on GET /courses
+        IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)], name="createdAt_id"),
+    ],
+}
+
+
+async def ensure_indexes(db):
+    """Create every registered index; existing identical indexes are a no-op.
+
+    A missing secondary index only costs speed, so startup carries on. Registration and
+    enrollment rely on the unique indexes to reject duplicates (DuplicateKeyError), so
+    startup fails if one of those can't be built, e.g. because duplicates already exist.
+    """
+    for collection_name, indexes in INDEXES.items():
+        for index in indexes:
+            try:
+                await db[collection_name].create_indexes([index])
+            except OperationFailure as e:
+                name = index.document["name"]
+                if index.document.get("unique"):
+                    raise RuntimeError(
+                        f"Unique index {name} on {collection_name} could not be built; "
+                        f"remove the duplicate documents and restart: {e}"
+                    ) from e
+                print(f"Error creating index {name} on {collection_name}: {e}")
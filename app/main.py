@@ -1,11 +1,41 @@
 import os
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from app.routers import courses, auth, teacher_courses, profile_teacher
+from app.config import CHANGE_FEED_ENABLED, UPLOAD_DIR
+from app.database.indexes import ensure_indexes
+from app.database import mongo
+from app.routers import assets, courses, auth, enrollments, events, teacher_courses, profile_teacher, system
+from app.services.changefeed import change_feed
+from app.services.compression import CompressionMiddleware
+from app.services.counters import student_counter
+from app.services.facets import catalog_facets
+from app.services.images import image_executor
+from app.services.metrics import MetricsMiddleware, track_in_flight
+from app.services.passwords import password_hasher
+from app.services.storage import ImmutableStaticFiles
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    mongo.connect()
+    await mongo.warmup()
+    await ensure_indexes(mongo.db)
+    student_counter.start()
+    catalog_facets.start()
+    if CHANGE_FEED_ENABLED:
+        change_feed.start()
+    yield
+    await change_feed.stop()
+    await student_counter.stop()
+    await catalog_facets.stop()
+    image_executor.shutdown()
+    password_hasher.shutdown()
+    mongo.close()
+
+
+app = FastAPI(lifespan=lifespan, dependencies=[Depends(track_in_flight)])
 
 # CORS settings
 app.add_middleware(
@@ -16,15 +46,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for JSON payloads above COMPRESSION_MIN_SIZE
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency histograms / slow-request log (served at /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Include your API routers
 app.include_router(courses.router)
 app.include_router(auth.router)
 app.include_router(teacher_courses.router, prefix="/teacher_courses", tags=["Teacher Courses"])
 app.include_router(profile_teacher.router, prefix="/profile", tags=["Profile"])
+app.include_router(enrollments.router, prefix="/enrollments", tags=["Enrollments"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(assets.router, prefix="/assets", tags=["Assets"])
+app.include_router(system.router, tags=["System"])
 
 # Serve upload static files
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
-app.mount("/static", StaticFiles(directory=UPLOAD_DIR), name="static")
+app.mount("/static", ImmutableStaticFiles(directory=UPLOAD_DIR), name="static")
 
 # Adjust path to your React dist folder
 REACT_DIST_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "dist"))
@@ -32,5 +71,6 @@ REACT_DIST_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    # Production: `python -m app.serve`; this stays the auto-reloading dev server
+    from app.serve import serve_uvicorn
+    serve_uvicorn("0.0.0.0", 8000, workers=1, reload=True)
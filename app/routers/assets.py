@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
+from datetime import datetime
+from bson import ObjectId
+from typing import Dict, Optional
+from app.database.mongo import asset_collection
+from app.services.blobs import acquire_blobs, asset_blob_urls, release_blobs
+from app.services.images import default_variant, save_thumbnail_file
+from app.services.storage import store_file
+from app.services.uploads import receive_upload
+
+router = APIRouter()
+
+# ------------------ Models ------------------ #
+
+class AssetInDB(BaseModel):
+    id: str
+    kind: str
+    content_type: str
+    filename: Optional[str] = None
+    size: int
+    url: str
+    variants: Optional[Dict[str, str]] = None
+    created_at: datetime
+
+# ------------------ Routes ------------------ #
+
+@router.post("/", response_model=AssetInDB)
+async def upload_asset(request: Request):
+    """Upload a course thumbnail or PDF brochure as multipart/form-data (field `file`).
+
+    The returned id can be sent as `thumbnail_asset_id` / `brochure_asset_id`
+    when creating or updating a teacher course. The asset holds its own reference
+    on the stored files until it is deleted.
+    """
+    upload = await receive_upload(request)
+    asset_id = ObjectId()
+    try:
+        if upload.kind == "image":
+            variants = await save_thumbnail_file(upload.path)
+            url = default_variant(variants)
+        else:
+            with open(upload.path, "rb") as f:
+                if f.read(5) != b"%PDF-":
+                    raise HTTPException(status_code=400, detail="Invalid PDF file")
+            variants = None
+            url = store_file(upload.path, upload.sha256.hexdigest(), "pdf")
+    finally:
+        upload.discard()
+
+    asset_data = {
+        "_id": asset_id,
+        "kind": upload.kind,
+        "content_type": upload.content_type,
+        "filename": upload.filename or None,
+        "size": upload.size,
+        "url": url,
+        "variants": variants,
+        "created_at": datetime.utcnow(),
+        "holds_refs": True,
+    }
+    await acquire_blobs(asset_blob_urls(asset_data))
+    await asset_collection.insert_one(asset_data)
+    return AssetInDB(id=str(asset_id), **{k: v for k, v in asset_data.items() if k != "_id"})
+
+@router.delete("/{asset_id}", response_model=dict)
+async def delete_asset(asset_id: str):
+    """Delete an uploaded asset. Courses created from it keep their own references to the files."""
+    if not ObjectId.is_valid(asset_id):
+        raise HTTPException(status_code=400, detail="Invalid asset ID")
+    deleted = await asset_collection.find_one_and_delete({"_id": ObjectId(asset_id)})
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    # Assets uploaded before they held references have nothing to release
+    if deleted.get("holds_refs"):
+        await release_blobs(asset_blob_urls(deleted))
+    return {"message": "Asset deleted successfully"}
@@ -2,36 +2,42 @@ from fastapi import APIRouter, HTTPException
 from app.models.user import UserRegister, UserLogin
 from app.models.student import StudentRegister, StudentLogin
 from app.database.mongo import db
-import bcrypt
+from app.services.passwords import password_hasher
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter()
 
 # Register User
 @router.post("/register/user")
 async def register_user(user: UserRegister):
-    user_exist = await db.users.find_one({"username": user.username})
-    if user_exist:
-        raise HTTPException(status_code=400, detail="Username already exists")
-    hashed_password = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt())
+    hashed_password = await password_hasher.hash(user.password)
     user_dict = user.dict()
     user_dict["password"] = hashed_password
-    await db.users.insert_one(user_dict)
+    # Uniqueness is enforced by the users.username index (app/database/indexes.py)
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Username already exists")
     return {"message": "User registered successfully"}
 
 # Register Student
 @router.post("/register/student")
 async def register_student(student: StudentRegister):
-    student_exist = await db.students.find_one({"email": student.email})
-    if student_exist:
+    student_dict = student.dict()
+    student_dict["password"] = await password_hasher.hash(student.password)
+    # Uniqueness is enforced by the students.email index (app/database/indexes.py)
+    try:
+        result = await db.students.insert_one(student_dict)
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Student already exists")
-    await db.students.insert_one(student.dict())
-    return {"message": "Student registered successfully"}
+    # The id is what POST /enrollments/ takes
+    return {"message": "Student registered successfully", "id": str(result.inserted_id)}
 
 # Login User
 @router.post("/login/user")
 async def login_user(user: UserLogin):
     user_db = await db.users.find_one({"username": user.username})
-    if not user_db or user.password != user_db["password"]:
+    if not user_db or not await password_hasher.verify(user.password, user_db["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return {"message": "User login successful"}
 
@@ -39,6 +45,6 @@ async def login_user(user: UserLogin):
 @router.post("/login/student")
 async def login_student(student: StudentLogin):
     student_db = await db.students.find_one({"email": student.email})
-    if not student_db or student.password != student_db["password"]:
+    if not student_db or not await password_hasher.verify(student.password, student_db["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return {"message": "Student login successful"}
@@ -1,12 +1,19 @@
 # courses.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, List
+from typing import Literal, Optional, List, Union
 from datetime import datetime
 from uuid import uuid4
+from app.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.database.mongo import courses_collection
 from app.models.course import CourseInDB,CourseCreate,CourseBase
 from bson import ObjectId
+from app.services.cache import document_cache
+from app.services.export import export_response
+from app.services.fields import fields_projection, parse_fields, partial_model, select_fields
+from app.services.pagination import keyset_filter, keyset_sort, paginate
+from app.services.serialization import JSONBytesResponse, dumps
+from app.services.singleflight import SingleFlight
 
 
 router = APIRouter()
@@ -25,36 +32,85 @@ class CourseInDB(CourseBase):
     createdAt: datetime
     updatedAt: Optional[datetime] = None
 
-@router.get("/courses", response_model=List[CourseInDB])
-async def get_courses():
-    courses = await courses_collection.find().to_list(100)
-    return [
-        CourseInDB(
-            id=str(course["_id"]),
-            name=course["name"],
-            description=course["description"],
-            imageUrl=course.get("imageUrl"),
-            category=course.get("category", "General"),
-            createdAt=course["createdAt"],
-            updatedAt=course.get("updatedAt"),
-        )
-        for course in courses
-    ]
-
-@router.get("/courses/{course_id}", response_model=CourseInDB)
-async def get_course(course_id: str):
-    course = await courses_collection.find_one({"_id": ObjectId(course_id)})
-    if not course:
+class CoursePage(BaseModel):
+    items: List[CourseInDB]
+    next: Optional[str] = None
+
+CoursePartial = partial_model(CourseInDB)
+
+class CoursePartialPage(BaseModel):
+    items: List[CoursePartial]
+    next: Optional[str] = None
+
+FIELDS_DESCRIPTION = "Comma-separated CourseInDB fields to return (e.g. name,imageUrl)"
+
+# Concurrent identical reads share one query and one serialized body
+list_reads = SingleFlight("courses_list")
+course_reads = SingleFlight("course")
+
+@router.get("/courses", response_model=Union[CoursePage, CoursePartialPage])
+async def get_courses(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    selected = parse_fields(fields, CourseInDB)
+    projection = fields_projection(selected, always=["createdAt"]) if selected else None
+
+    async def load() -> bytes:
+        courses = await courses_collection.find(
+            keyset_filter(cursor, "createdAt"), projection
+        ).sort(keyset_sort("createdAt")).limit(limit + 1).to_list(limit + 1)
+        courses, next_cursor = paginate(courses, limit, "createdAt")
+        items = [course_to_dict(course) for course in courses]
+        if selected:
+            items = [select_fields(item, selected) for item in items]
+        return dumps({"items": items, "next": next_cursor})
+
+    return JSONBytesResponse(await list_reads.do((limit, cursor, tuple(selected or ())), load))
+
+EXPORT_CSV_HEADER = ["id", "name", "description", "imageUrl", "category", "createdAt", "updatedAt"]
+
+@router.get("/courses/export")
+async def export_courses(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    category: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only courses created or updated at/after since"),
+):
+    """Stream every course as NDJSON or CSV."""
+    watermark = datetime.utcnow()
+    query = {}
+    if category is not None:
+        query["category"] = category
+    if since is not None:
+        query["$or"] = [{"updatedAt": {"$gte": since}}, {"createdAt": {"$gte": since}}]
+    cursor = courses_collection.find(query).sort("_id", 1)
+
+    def to_rows(course):
+        course = course_to_dict(course)
+        yield [course[column] for column in EXPORT_CSV_HEADER]
+
+    return export_response(cursor, format, "courses", course_to_dict, EXPORT_CSV_HEADER, to_rows, watermark)
+
+@router.get("/courses/{course_id}", response_model=Union[CourseInDB, CoursePartial])
+async def get_course(course_id: str, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
+    selected = parse_fields(fields, CourseInDB)
+
+    async def load() -> Optional[bytes]:
+        if selected:
+            course = await courses_collection.find_one({"_id": ObjectId(course_id)}, fields_projection(selected))
+        else:
+            course = await document_cache.find_one(courses_collection, ObjectId(course_id))
+        if not course:
+            return None
+        if selected:
+            return dumps(select_fields(course_to_dict(course), selected))
+        return dumps(course_to_dict(course))
+
+    body = await course_reads.do((course_id, tuple(selected or ())), load)
+    if body is None:
         raise HTTPException(status_code=404, detail="Course not found")
-    return CourseInDB(
-        id=str(course["_id"]),
-        name=course["name"],
-        description=course["description"],
-        imageUrl=course.get("imageUrl"),
-        category=course.get("category", "General"),
-        createdAt=course["createdAt"],
-        updatedAt=course.get("updatedAt"),
-    )
+    return JSONBytesResponse(body)
 
 @router.post("/courses", response_model=CourseInDB)
 async def create_course(course: CourseCreate):
@@ -69,3 +125,15 @@ async def create_course(course: CourseCreate):
     }
     result = await courses_collection.insert_one(new_course)
     return CourseInDB(id=str(result.inserted_id), **new_course)
+
+def course_to_dict(course) -> dict:
+    # Same shape as CourseInDB, built without re-validating trusted database reads
+    return {
+        "name": course.get("name"),
+        "description": course.get("description"),
+        "imageUrl": course.get("imageUrl"),
+        "category": course.get("category", "General"),
+        "id": str(course["_id"]),
+        "createdAt": course.get("createdAt"),
+        "updatedAt": course.get("updatedAt"),
+    }
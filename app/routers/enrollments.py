@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
+
+from app.database.mongo import db, enrollment_collection, teacher_course_collection
+from app.services.counters import student_counter
+
+router = APIRouter()
+
+class EnrollmentCreate(BaseModel):
+    student_id: str
+    course_id: str
+
+class EnrollmentInDB(EnrollmentCreate):
+    id: str
+    created_at: datetime
+
+def object_id(value: str, name: str) -> ObjectId:
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=f"Invalid {name} ID")
+    return ObjectId(value)
+
+def enrollment_to_dict(enrollment: dict) -> dict:
+    return {
+        "id": str(enrollment["_id"]),
+        "student_id": str(enrollment["student_id"]),
+        "course_id": str(enrollment["course_id"]),
+        "created_at": enrollment["created_at"],
+    }
+
+@router.post("/", response_model=EnrollmentInDB)
+async def enroll(enrollment: EnrollmentCreate):
+    student_id = object_id(enrollment.student_id, "student")
+    course_id = object_id(enrollment.course_id, "course")
+    if not await db.students.find_one({"_id": student_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Student not found")
+    if not await teacher_course_collection.find_one({"_id": course_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Teacher Course not found")
+
+    enrollment_dict = {"student_id": student_id, "course_id": course_id, "created_at": datetime.utcnow()}
+    # One enrollment per (student, course) is enforced by the enrollments index (app/database/indexes.py)
+    try:
+        await enrollment_collection.insert_one(enrollment_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Student already enrolled")
+    student_counter.add(course_id, 1)
+    return enrollment_to_dict(enrollment_dict)
+
+@router.get("/student/{student_id}", response_model=List[EnrollmentInDB])
+async def get_student_enrollments(student_id: str):
+    enrollments = await enrollment_collection.find(
+        {"student_id": object_id(student_id, "student")}
+    ).to_list(None)
+    return [enrollment_to_dict(enrollment) for enrollment in enrollments]
+
+@router.delete("/{enrollment_id}", response_model=dict)
+async def unenroll(enrollment_id: str):
+    deleted = await enrollment_collection.find_one_and_delete({"_id": object_id(enrollment_id, "enrollment")})
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Enrollment not found")
+    student_counter.add(deleted["course_id"], -1)
+    return {"message": "Enrollment deleted successfully"}
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query, Request
+from starlette.responses import StreamingResponse
+
+from app.config import SSE_HEARTBEAT_SECONDS
+from app.services.changefeed import change_feed
+from app.services.serialization import dumps
+
+router = APIRouter()
+
+@router.get("/")
+async def stream_events(
+    request: Request,
+    collection: Optional[Literal["teacher_courses", "course", "profile"]] = None,
+    ids: Optional[str] = Query(None, description="Comma-separated document ids to follow"),
+):
+    """Server-Sent Events: one `change` event per insert/update/delete, instead of polling GET endpoints."""
+    wanted = {_id.strip() for _id in ids.split(",") if _id.strip()} if ids else None
+    subscription = change_feed.subscribe(collection, wanted)
+
+    async def events():
+        try:
+            # Comment line so clients and proxies see the stream open right away
+            yield b": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield b"event: change\ndata: " + dumps(event) + b"\n\n"
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from app.database.mongo import profile_collection
+from app.services.cache import document_cache
+from app.services.conditional import (
+    Representation, conditional_response, content_etag, etag_matches, version_etag,
+)
+from app.services.serialization import JSONBytesResponse, dumps
 from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument
+from starlette.responses import Response
 
 router = APIRouter()
 
@@ -45,24 +53,29 @@ def fix_id(profile_dict):
 @router.post("/", response_model=ProfileModel)
 async def create_profile(profile: CreateProfileModel):
     profile_dict = profile.dict(exclude_unset=True)
-    result = await profile_collection.insert_one(profile_dict)
-    new_profile = await profile_collection.find_one({"_id": result.inserted_id})
-    if not new_profile:
-        raise HTTPException(status_code=404, detail="Failed to retrieve created profile")
-
-    new_profile = fix_id(new_profile)
-    return new_profile
+    # Lets the change feed's polling fallback see new profiles (not part of ProfileModel)
+    profile_dict["updated_at"] = datetime.utcnow()
+    # insert_one fills in profile_dict["_id"], so the response is exactly what was written
+    await profile_collection.insert_one(profile_dict)
+    return fix_id(profile_dict)
 
 
 @router.get("/{profile_id}", response_model=ProfileModel)
-async def get_profile(profile_id: str):
+async def get_profile(profile_id: str, request: Request):
     if not ObjectId.is_valid(profile_id):
         raise HTTPException(status_code=400, detail="Invalid profile ID")
-    profile = await profile_collection.find_one({"_id": ObjectId(profile_id)})
+    profile = await document_cache.find_one(profile_collection, ObjectId(profile_id))
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    profile = fix_id(profile)
-    return profile
+    if profile.get("updated_at"):
+        representation = Representation(version_etag(profile), lambda: ProfileModel(**fix_id(profile)).dict())
+        return conditional_response(request, representation)
+    # Profiles written before updated_at was recorded: the ETag is a hash of the response body
+    body = dumps(ProfileModel(**fix_id(profile)).dict())
+    headers = {"ETag": content_etag(body), "Cache-Control": "no-cache"}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return JSONBytesResponse(body, headers=headers)
 
 
 @router.put("/{profile_id}", response_model=ProfileModel)
@@ -74,14 +87,18 @@ async def update_profile(profile_id: str, update: ProfileUpdateModel):
     if not update_data:
         raise HTTPException(status_code=400, detail="No update fields provided")
 
-    result = await profile_collection.update_one(
-        {"_id": ObjectId(profile_id)},
-        {"$set": update_data}
+    # Only match when some field actually changes, so a no-op PUT doesn't bump updated_at,
+    # write the document or send change-feed invalidations to every worker
+    previous = await profile_collection.find_one_and_update(
+        {"_id": ObjectId(profile_id), "$or": [{k: {"$ne": v}} for k, v in update_data.items()]},
+        {"$set": {**update_data, "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.BEFORE,
     )
+    if not previous:
+        if await profile_collection.count_documents({"_id": ObjectId(profile_id)}, limit=1):
+            raise HTTPException(status_code=404, detail="Profile not modified")
+        raise HTTPException(status_code=404, detail="Profile not found")
 
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Profile not found or not modified")
-
-    updated = await profile_collection.find_one({"_id": ObjectId(profile_id)})
-    updated = fix_id(updated)
+    await document_cache.invalidate(profile_collection.name, ObjectId(profile_id))
+    updated = fix_id({**previous, **update_data})
     return updated
@@ -0,0 +1,50 @@
+import time
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.database import mongo
+from app.services.cache import document_cache
+from app.services.changefeed import change_feed
+from app.services.counters import student_counter
+from app.services.grading import answer_keys
+from app.services.metrics import render_prometheus
+from app.services.passwords import password_hasher
+
+router = APIRouter()
+
+@router.get("/system/health")
+async def get_health():
+    """Liveness plus Mongo round-trip time and connection pool usage."""
+    start = time.perf_counter()
+    try:
+        await mongo.get_client().admin.command("ping")
+    except Exception as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "error": str(e), "pool": mongo.pool_stats.snapshot()},
+        )
+    return {
+        "status": "ok",
+        "mongo_ping_ms": round((time.perf_counter() - start) * 1000, 2),
+        "pool": mongo.pool_stats.snapshot(),
+    }
+
+@router.get("/system/cache")
+async def get_cache_stats():
+    return document_cache.stats()
+
+@router.get("/system/passwords")
+async def get_password_hasher_stats():
+    return password_hasher.stats()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of request, Mongo command, pool, cache and hasher metrics."""
+    body = render_prometheus({
+        "mongo_pool": mongo.pool_stats.snapshot(),
+        "document_cache": document_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "student_counter": student_counter.stats(),
+        "change_feed": change_feed.stats(),
+        "answer_keys": answer_keys.stats(),
+    })
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -1,14 +1,29 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Query, Request
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from pydantic import BaseModel, Field, ValidationError
 from datetime import datetime
 from uuid import uuid4
 from bson import ObjectId
-from typing import List, Optional
-import os
-import base64
-from app.database.mongo import teacher_course_collection
-from PIL import Image
-from io import BytesIO
+from typing import Dict, List, Literal, Optional, Union
+import json
+from app.config import DEFAULT_PAGE_SIZE, IMPORT_BATCH_SIZE, IMPORT_MAX_LINE_BYTES, MAX_PAGE_SIZE, MAX_QUIZ_SUBMISSIONS
+from app.database.mongo import enrollment_collection, teacher_course_collection
+from app.services.cache import document_cache
+from app.services.export import export_response
+from app.services.facets import FACET_DEFAULTS, catalog_facets
+from app.services.grading import answer_keys, grade, public_modules, restore_answer_keys, save_attempts
+from app.services.conditional import Representation, conditional_response, version_etag
+from app.services.fields import fields_projection, parse_fields, partial_model, select_fields
+from app.services.blobs import acquire_blobs, course_blob_urls, release_blobs, swap_blobs
+from app.services.images import default_variant, save_thumbnail
+from app.services.ndjson import iter_lines
+from app.services.pagination import keyset_filter, keyset_sort, paginate
+from app.services.rollups import ROLLUP_REFRESH, apply_rollups
+from app.services.metrics import stage
+from app.services.serialization import JSONBytesResponse, dumps
+from app.services.singleflight import SingleFlight
+from app.services.uploads import resolve_asset
 
 router = APIRouter()
 
@@ -23,12 +38,18 @@ class Quiz(BaseModel):
     title: str
     questions: List[Question]
 
+class Rollup(BaseModel):
+    total_seconds: int = 0
+    lesson_count: int = 0
+    quiz_count: int = 0
+
 class Lesson(BaseModel):
     title: str
     video_url: str
     duration: str
     resource_url: str
     summary: str
+    id: str = Field(default_factory=lambda: str(ObjectId()))
 
 class Module(BaseModel):
     title: str
@@ -36,6 +57,21 @@ class Module(BaseModel):
     lessons: List[Lesson] = []
     quiz: Optional[Quiz] = None
     id: str = Field(default_factory=lambda: str(ObjectId()))
+    rollup: Optional[Rollup] = None
+
+class ModuleUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+
+class LessonUpdate(BaseModel):
+    title: Optional[str] = None
+    video_url: Optional[str] = None
+    duration: Optional[str] = None
+    resource_url: Optional[str] = None
+    summary: Optional[str] = None
+
+class OrderUpdate(BaseModel):
+    ids: List[str]
 
 class CourseBase(BaseModel):
     title: str
@@ -47,46 +83,177 @@ class CourseBase(BaseModel):
 
 class CourseCreate(CourseBase):
     thumbnail_image: Optional[str] = None
+    thumbnail_asset_id: Optional[str] = None
+    brochure_asset_id: Optional[str] = None
+
+# PUT accepts a course as read back from GET, where answer keys are hidden: an omitted
+# correct_answer keeps the stored one
+class EditQuestion(Question):
+    correct_answer: Optional[int] = None
+
+class EditQuiz(Quiz):
+    questions: List[EditQuestion]
+
+class EditModule(Module):
+    quiz: Optional[EditQuiz] = None
+
+class CourseUpdate(CourseCreate):
+    modules: List[EditModule] = []
 
 class CourseInDB(CourseBase):
     id: str
     thumbnail_image: Optional[str] = None
+    thumbnail_variants: Optional[Dict[str, str]] = None
+    brochure_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     student_count: int
+    rollup: Optional[Rollup] = None
 
     class Config:
         json_encoders = {ObjectId: str}
 
+# Read responses never include answer keys (see app/services/grading.py)
+class PublicQuestion(BaseModel):
+    question: str
+    options: List[str]
+
+class PublicQuiz(BaseModel):
+    title: str
+    questions: List[PublicQuestion]
 
+class PublicModule(Module):
+    quiz: Optional[PublicQuiz] = None
 
-UPLOAD_DIR = os.getenv("UPLOAD_DIR", "./uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+class CoursePublic(CourseInDB):
+    modules: List[PublicModule] = []
 
-def save_thumbnail(thumbnail_image: str) -> str:
-    if not thumbnail_image.startswith("data:image/"):
-        raise HTTPException(status_code=400, detail="Invalid image format")
+class QuizSubmission(BaseModel):
+    student_id: str
+    answers: List[Optional[int]]
 
-    try:
-        header, encoded = thumbnail_image.split(",", 1)
-        file_ext = header.split("/")[1].split(";")[0]
-        image_data = base64.b64decode(encoded)
-        image = Image.open(BytesIO(image_data))
-        image.load()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid base64 image: {str(e)}")
-
-    file_id = str(ObjectId())
-    filename = f"{file_id}.{file_ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    image.save(filepath)
-    return f"/uploads/{filename}"
+class QuizSubmissionBatch(BaseModel):
+    submissions: List[QuizSubmission]
+
+class QuizResult(BaseModel):
+    student_id: str
+    attempt_id: str
+    score: int
+    total: int
+    correct: List[bool]
+
+class QuizGradeReport(BaseModel):
+    results: List[QuizResult]
+
+class CourseSummary(BaseModel):
+    id: str
+    title: str
+    description: str
+    category: str = "General"
+    level: str = "Beginner"
+    status: str = "draft"
+    thumbnail_image: Optional[str] = None
+    thumbnail_variants: Optional[Dict[str, str]] = None
+    brochure_url: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    student_count: int
+    rollup: Optional[Rollup] = None
+
+class ModuleOutline(BaseModel):
+    id: str
+    title: str
+    rollup: Optional[Rollup] = None
+
+class CourseOutline(BaseModel):
+    id: str
+    title: str
+    rollup: Optional[Rollup] = None
+    modules: List[ModuleOutline] = []
+
+class CoursePage(BaseModel):
+    items: List[CoursePublic]
+    next: Optional[str] = None
+
+class CourseSummaryPage(BaseModel):
+    items: List[CourseSummary]
+    next: Optional[str] = None
+
+CoursePartial = partial_model(CoursePublic)
+
+class CoursePartialPage(BaseModel):
+    items: List[CoursePartial]
+    next: Optional[str] = None
+
+class CourseSearchHit(CourseSummary):
+    score: float
+
+class CourseSearchPage(BaseModel):
+    items: List[CourseSearchHit]
+    next: Optional[str] = None
+
+class FacetCounts(BaseModel):
+    category: Dict[str, int]
+    level: Dict[str, int]
+    status: Dict[str, int]
+    total: int
+    updated_at: Optional[datetime] = None
+    recomputed_at: Optional[datetime] = None
+
+class CourseBatch(BaseModel):
+    items: List[Union[CoursePublic, CoursePartial]]
+    missing: List[str] = []
+
+class ImportResult(BaseModel):
+    line: int
+    status: Literal["created", "error"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class ImportReport(BaseModel):
+    created: int
+    failed: int
+    results: List[ImportResult]
+
+# Summary view never pulls the curriculum tree out of Mongo
+SUMMARY_PROJECTION = {"modules": 0}
+FIELDS_DESCRIPTION = "Comma-separated CourseInDB fields to return (e.g. title,thumbnail_image,student_count)"
+# Fields that reference files in the upload store (see app/services/blobs.py)
+MEDIA_PROJECTION = {"thumbnail_image": 1, "thumbnail_variants": 1, "brochure_url": 1}
+# Fields counted by the catalog facets (see app/services/facets.py)
+FACET_PROJECTION = {field: 1 for field in FACET_DEFAULTS}
+# Outline reads titles and stored rollups only, never lesson bodies or quizzes
+OUTLINE_PROJECTION = {"title": 1, "rollup": 1, "modules.id": 1, "modules.title": 1, "modules.rollup": 1}
+
+async def course_media(course: CourseCreate) -> dict:
+    """Resolve thumbnail/brochure fields from uploaded assets or an inline base64 thumbnail."""
+    media = {}
+    if course.thumbnail_asset_id:
+        variants = (await resolve_asset(course.thumbnail_asset_id, "image"))["variants"]
+    elif course.thumbnail_image:
+        variants = await save_thumbnail(course.thumbnail_image)
+    else:
+        variants = None
+    if variants:
+        media["thumbnail_image"] = default_variant(variants)
+        media["thumbnail_variants"] = variants
+    if course.brochure_asset_id:
+        media["brochure_url"] = (await resolve_asset(course.brochure_asset_id, "pdf"))["url"]
+    return media
+
+# Concurrent identical reads share one query and one serialized body
+list_reads = SingleFlight("teacher_courses_list")
+course_reads = SingleFlight("teacher_course")
+modules_reads = SingleFlight("teacher_course_modules")
+
+def course_etag(course: dict, *variant: str) -> str:
+    # student_count is bumped by the enrollment counter without touching updated_at
+    return version_etag(course, str(course.get("student_count")), *variant)
 
 # ------------------ Routes ------------------ #
 
-@router.post("/", response_model=CourseInDB)
-async def create_teacher_course(course: CourseCreate):
-    thumbnail_url = save_thumbnail(course.thumbnail_image) if course.thumbnail_image else None
+async def build_course_document(course: CourseCreate) -> dict:
+    media = await course_media(course)
 
     course_data = {
         "title": course.title,
@@ -94,7 +261,9 @@ async def create_teacher_course(course: CourseCreate):
         "category": course.category,
         "level": course.level,
         "status": course.status or "draft",
-        "thumbnail_image": thumbnail_url,
+        "thumbnail_image": media.get("thumbnail_image"),
+        "thumbnail_variants": media.get("thumbnail_variants"),
+        "brochure_url": media.get("brochure_url"),
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
         "student_count": 0,
@@ -105,25 +274,240 @@ async def create_teacher_course(course: CourseCreate):
         module_data = module.dict(exclude={"id"})
         module_data["id"] = str(ObjectId())
         course_data["modules"].append(module_data)
+    course_data["rollup"] = apply_rollups(course_data["modules"])
+    return course_data
 
+@router.post("/", response_model=CourseInDB)
+async def create_teacher_course(course: CourseCreate):
+    course_data = await build_course_document(course)
     result = await teacher_course_collection.insert_one(course_data)
+    await acquire_blobs(course_blob_urls(course_data))
+    await catalog_facets.apply(after=[course_data])
     return CourseInDB(id=str(result.inserted_id), **course_data)
 
-@router.get("/", response_model=List[CourseInDB])
-async def get_teacher_courses():
-    courses = await teacher_course_collection.find().to_list(100)
-    return [parse_course(course) for course in courses]
+async def insert_import_batch(batch: List[tuple], results: List[ImportResult]):
+    """Unordered insert_many of (line, document) pairs; one failed record never blocks the rest."""
+    failed = {}
+    try:
+        await teacher_course_collection.insert_many([doc for _, doc in batch], ordered=False)
+    except BulkWriteError as e:
+        failed = {err["index"]: err.get("errmsg", "Write failed") for err in e.details.get("writeErrors", [])}
+
+    inserted = []
+    for index, (line, doc) in enumerate(batch):
+        if index in failed:
+            results.append(ImportResult(line=line, status="error", error=failed[index]))
+        else:
+            results.append(ImportResult(line=line, status="created", id=str(doc["_id"])))
+            inserted.append(doc)
+    # One reference per course, even when several imported courses share a file
+    await acquire_blobs(url for doc in inserted for url in course_blob_urls(doc))
+    await catalog_facets.apply(after=inserted)
+
+@router.post("/import", response_model=ImportReport)
+async def import_teacher_courses(request: Request):
+    """Bulk-create courses from an NDJSON body (one CourseCreate object per line)."""
+    results = []
+    batch = []
+    line_no = 0
+    async for line in iter_lines(request.stream(), IMPORT_MAX_LINE_BYTES):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            course = CourseCreate.parse_obj(json.loads(line))
+            batch.append((line_no, await build_course_document(course)))
+        except (ValueError, ValidationError) as e:
+            results.append(ImportResult(line=line_no, status="error", error=str(e)))
+            continue
+        except HTTPException as e:
+            results.append(ImportResult(line=line_no, status="error", error=str(e.detail)))
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await insert_import_batch(batch, results)
+            batch = []
+    if batch:
+        await insert_import_batch(batch, results)
+
+    results.sort(key=lambda r: r.line)
+    created = sum(1 for r in results if r.status == "created")
+    return ImportReport(created=created, failed=len(results) - created, results=results)
+
+@router.get("/", response_model=Union[CoursePage, CourseSummaryPage, CoursePartialPage])
+async def get_teacher_courses(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """`fields` takes precedence over `view`."""
+    selected = parse_fields(fields, CourseInDB)
+    if selected:
+        projection = fields_projection(selected, always=["created_at"])
+    else:
+        projection = SUMMARY_PROJECTION if view == "summary" else None
+
+    async def load() -> bytes:
+        courses = await teacher_course_collection.find(
+            keyset_filter(cursor, "created_at"), projection
+        ).sort(keyset_sort("created_at")).limit(limit + 1).to_list(limit + 1)
+        courses, next_cursor = paginate(courses, limit, "created_at")
+
+        if selected:
+            items = [select_fields(course_to_dict(course), selected) for course in courses]
+        else:
+            to_dict = course_summary_to_dict if view == "summary" else course_to_dict
+            items = [to_dict(course) for course in courses]
+        return dumps({"items": items, "next": next_cursor})
+
+    key = (limit, cursor, view, tuple(selected or ()))
+    return JSONBytesResponse(await list_reads.do(key, load))
+
+@router.get("/batch", response_model=CourseBatch)
+async def get_teacher_courses_batch(
+    ids: str = Query(..., description="Comma-separated course ids"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Resolve many courses with a single `$in` query, in the order they were requested."""
+    selected = parse_fields(fields, CourseInDB)
+    requested = [course_id.strip() for course_id in ids.split(",") if course_id.strip()]
+    if len(requested) > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PAGE_SIZE} ids per request")
+    if not all(ObjectId.is_valid(course_id) for course_id in requested):
+        raise HTTPException(status_code=400, detail="Invalid course ID")
+
+    object_ids = list({ObjectId(course_id) for course_id in requested})
+    projection = fields_projection(selected) if selected else None
+    courses = await teacher_course_collection.find({"_id": {"$in": object_ids}}, projection).to_list(len(object_ids))
+    by_id = {str(course["_id"]): course_to_dict(course) for course in courses}
+    if selected:
+        by_id = {course_id: select_fields(course, selected) for course_id, course in by_id.items()}
+    return JSONBytesResponse({
+        "items": [by_id[course_id] for course_id in requested if course_id in by_id],
+        "missing": [course_id for course_id in requested if course_id not in by_id],
+    })
+
+@router.get("/search", response_model=CourseSearchPage)
+async def search_teacher_courses(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    level: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """Rank courses by the weighted `course_text` index; pages continue on (score, _id)."""
+    match = {"$text": {"$search": q}}
+    for field, value in (("category", category), ("level", level), ("status", status)):
+        if value is not None:
+            match[field] = value
+
+    pipeline = [
+        {"$match": match},
+        {"$project": SUMMARY_PROJECTION},
+        {"$set": {"score": {"$meta": "textScore"}}},
+    ]
+    if cursor:
+        pipeline.append({"$match": keyset_filter(cursor, "score")})
+    pipeline += [
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit + 1},
+    ]
+    courses = await teacher_course_collection.aggregate(pipeline).to_list(limit + 1)
+    courses, next_cursor = paginate(courses, limit, "score")
+
+    items = []
+    for course in courses:
+        item = course_summary_to_dict(course)
+        item["score"] = course["score"]
+        items.append(item)
+    return JSONBytesResponse({"items": items, "next": next_cursor})
+
+@router.get("/facets", response_model=FacetCounts)
+async def get_teacher_course_facets():
+    """Course counts per category, level and status, read from one materialized stats document."""
+    return JSONBytesResponse(await catalog_facets.get())
+
+EXPORT_CSV_HEADER = [
+    "course_id", "title", "category", "level", "status", "student_count", "created_at", "updated_at",
+    "module_id", "module_position", "module_title",
+    "lesson_id", "lesson_position", "lesson_title", "duration", "video_url", "resource_url", "summary",
+]
+
+def course_export_rows(course: dict):
+    """One CSV row per lesson; modules without lessons and courses without modules still get a row."""
+    prefix = [
+        str(course["_id"]), course.get("title"), course.get("category"), course.get("level"),
+        course.get("status"), course.get("student_count", 0), course.get("created_at"), course.get("updated_at"),
+    ]
+    modules = course.get("modules") or []
+    if not modules:
+        yield prefix + [None] * 10
+    for module_position, module in enumerate(modules):
+        module_cols = [module.get("id"), module_position, module.get("title")]
+        lessons = module.get("lessons") or []
+        if not lessons:
+            yield prefix + module_cols + [None] * 7
+        for lesson_position, lesson in enumerate(lessons):
+            yield prefix + module_cols + [
+                lesson.get("id"), lesson_position, lesson.get("title"), lesson.get("duration"),
+                lesson.get("video_url"), lesson.get("resource_url"), lesson.get("summary"),
+            ]
+
+@router.get("/export")
+async def export_teacher_courses(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    category: Optional[str] = None,
+    level: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only courses with updated_at >= since"),
+):
+    """Stream the whole catalog as NDJSON (CourseInDB per line) or CSV (one row per lesson)."""
+    watermark = datetime.utcnow()
+    query = {}
+    for field, value in (("category", category), ("level", level), ("status", status)):
+        if value is not None:
+            query[field] = value
+    if since is not None:
+        query["updated_at"] = {"$gte": since}
+        cursor = teacher_course_collection.find(query).sort([("updated_at", 1), ("_id", 1)])
+    else:
+        cursor = teacher_course_collection.find(query).sort("_id", 1)
+    return export_response(
+        cursor, format, "teacher_courses", course_to_dict, EXPORT_CSV_HEADER, course_export_rows, watermark
+    )
 
-@router.get("/{course_id}", response_model=CourseInDB)
-async def get_teacher_course(course_id: str):
-    course = await teacher_course_collection.find_one({"_id": ObjectId(course_id)})
-    if not course:
+@router.get("/{course_id}", response_model=Union[CoursePublic, CoursePartial])
+async def get_teacher_course(
+    course_id: str,
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    selected = parse_fields(fields, CourseInDB)
+
+    async def load() -> Optional[Representation]:
+        if selected:
+            # Partial reads go straight to Mongo with a projection; the cache only holds whole documents
+            course = await teacher_course_collection.find_one(
+                {"_id": ObjectId(course_id)}, fields_projection(selected, always=["updated_at"])
+            )
+        else:
+            course = await document_cache.find_one(teacher_course_collection, ObjectId(course_id))
+        if not course:
+            return None
+        if selected:
+            etag = course_etag(course, "fields=" + ",".join(selected))
+            return Representation(etag, lambda: select_fields(course_to_dict(course), selected))
+        return Representation(course_etag(course), lambda: course_to_dict(course))
+
+    representation = await course_reads.do((course_id, tuple(selected or ())), load)
+    if representation is None:
         raise HTTPException(status_code=404, detail="Teacher Course not found")
-    return parse_course(course)
+    return conditional_response(request, representation)
 
 @router.put("/{course_id}", response_model=CourseInDB)
-async def update_teacher_course(course_id: str, course: CourseCreate):
-    thumbnail_url = save_thumbnail(course.thumbnail_image) if course.thumbnail_image else None
+async def update_teacher_course(course_id: str, course: CourseUpdate):
+    media = await course_media(course)
 
     update_data = {
         "title": course.title,
@@ -133,63 +517,351 @@ async def update_teacher_course(course_id: str, course: CourseCreate):
         "status": course.status or "draft",
         "updated_at": datetime.utcnow()
     }
-
-    if thumbnail_url:
-        update_data["thumbnail_image"] = thumbnail_url
+    update_data.update(media)
 
     if course.modules:
-        processed_modules = []
-        for module in course.modules:
-            module_data = module.dict(exclude={"id"})
-            module_data["id"] = str(ObjectId())
-            processed_modules.append(module_data)
-        update_data["modules"] = processed_modules
-
-    result = await teacher_course_collection.update_one(
+        # Keep client-supplied module/lesson ids so they stay addressable across saves
+        update_data["modules"] = [module.dict() for module in course.modules]
+        if any(
+            question.correct_answer is None
+            for module in course.modules if module.quiz
+            for question in module.quiz.questions
+        ):
+            keys = await answer_keys.course(ObjectId(course_id))
+            if keys is None:
+                raise HTTPException(status_code=404, detail="Teacher Course not found")
+            missing = restore_answer_keys(update_data["modules"], keys)
+            if missing:
+                raise HTTPException(status_code=422, detail=f"correct_answer required for {', '.join(missing)}")
+        update_data["rollup"] = apply_rollups(update_data["modules"])
+
+    # Pre-image lets us rebuild the written document (and the old media refs) without a re-read
+    previous = await teacher_course_collection.find_one_and_update(
         {"_id": ObjectId(course_id)},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE,
     )
 
-    if result.modified_count == 0:
+    await document_cache.invalidate(teacher_course_collection.name, ObjectId(course_id))
+    if not previous:
         raise HTTPException(status_code=404, detail="Teacher Course not found")
 
-    updated_course = await teacher_course_collection.find_one({"_id": ObjectId(course_id)})
+    updated_course = {**previous, **update_data}
+    await catalog_facets.apply(before=[previous], after=[updated_course])
+    if media:
+        await swap_blobs(course_blob_urls(previous), course_blob_urls(updated_course))
     return parse_course(updated_course)
 
-@router.get("/{course_id}/modules", response_model=List[Module])
-async def get_course_modules(course_id: str):
-    course = await teacher_course_collection.find_one({"_id": ObjectId(course_id)}, {"modules": 1})
+@router.get("/{course_id}/outline", response_model=CourseOutline)
+async def get_course_outline(course_id: str):
+    course = await teacher_course_collection.find_one({"_id": ObjectId(course_id)}, OUTLINE_PROJECTION)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course.get("modules", [])
-
-@router.get("/{course_id}/modules", response_model=List[Module])
-async def get_course_modules(course_id: str):
-    course = await teacher_course_collection.find_one({"_id": ObjectId(course_id)}, {"modules": 1})
-    if not course:
+    return JSONBytesResponse({
+        "id": str(course["_id"]),
+        "title": course["title"],
+        "rollup": course.get("rollup"),
+        "modules": [
+            {"id": module.get("id"), "title": module.get("title"), "rollup": module.get("rollup")}
+            for module in course.get("modules", [])
+        ],
+    })
+
+@router.get("/{course_id}/modules", response_model=List[PublicModule])
+async def get_course_modules(course_id: str, request: Request):
+    async def load() -> Optional[Representation]:
+        course = await document_cache.find_one(teacher_course_collection, ObjectId(course_id))
+        if not course:
+            return None
+        return Representation(version_etag(course, "modules"), lambda: public_modules(course.get("modules", [])))
+
+    representation = await modules_reads.do(course_id, load)
+    if representation is None:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course.get("modules", [])
+    return conditional_response(request, representation)
 
 @router.delete("/{course_id}", response_model=dict)
 async def delete_teacher_course(course_id: str):
-    result = await teacher_course_collection.delete_one({"_id": ObjectId(course_id)})
-    if result.deleted_count == 0:
+    deleted = await teacher_course_collection.find_one_and_delete(
+        {"_id": ObjectId(course_id)}, projection={**MEDIA_PROJECTION, **FACET_PROJECTION}
+    )
+    await document_cache.invalidate(teacher_course_collection.name, ObjectId(course_id))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Teacher Course not found")
+    await enrollment_collection.delete_many({"course_id": ObjectId(course_id)})
+    await catalog_facets.apply(before=[deleted])
+    await release_blobs(course_blob_urls(deleted))
     return {"message": "Teacher Course deleted successfully"}
 
+# ------------------ Module / lesson routes ------------------ #
+# These touch a single element of `modules` in place instead of rewriting the array.
+
+async def modify_course(
+    course_id: str, match: dict, update, array_filters=None, projection=None, refresh_rollups=False
+) -> dict:
+    """Apply an in-place update to one course, invalidate its cache entry and return the result.
+
+    `refresh_rollups` recomputes the stored duration/lesson/quiz rollups server-side, for
+    edits that change lessons or quizzes: within the same write for pipeline updates, as a
+    second update otherwise, so readers can briefly see the edit with the old rollups.
+    """
+    if not ObjectId.is_valid(course_id):
+        raise HTTPException(status_code=400, detail="Invalid course ID")
+    if isinstance(update, dict):
+        update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+    elif refresh_rollups:
+        update = update + ROLLUP_REFRESH
+        refresh_rollups = False
+    course = await teacher_course_collection.find_one_and_update(
+        {"_id": ObjectId(course_id), **match},
+        update,
+        projection=projection or {"_id": 1},
+        array_filters=array_filters,
+        return_document=ReturnDocument.AFTER,
+    )
+    if course and refresh_rollups:
+        # Bump updated_at again so the ETag of the refreshed document differs from the interim one
+        await teacher_course_collection.update_one(
+            {"_id": ObjectId(course_id)},
+            ROLLUP_REFRESH + [{"$set": {"updated_at": datetime.utcnow()}}],
+        )
+    await document_cache.invalidate(teacher_course_collection.name, ObjectId(course_id))
+    if not course:
+        raise HTTPException(status_code=404, detail="Course, module or lesson not found")
+    return course
+
+def reorder(source: str, ids: List[str]) -> dict:
+    """Aggregation expression that rebuilds the array at `source` in the order of `ids`."""
+    return {
+        "$map": {
+            "input": ids,
+            "as": "item_id",
+            "in": {"$arrayElemAt": [source, {"$indexOfArray": [f"{source}.id", "$$item_id"]}]},
+        }
+    }
+
+def same_ids(ids: List[str]) -> dict:
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Duplicate ids in order")
+    return {"$all": ids}
+
+async def raise_if_id_taken(error: HTTPException, taken: dict, kind: str):
+    """Turn modify_course's 404 into a 409 when the add was refused because the id already exists."""
+    if await teacher_course_collection.count_documents(taken, limit=1):
+        raise HTTPException(status_code=409, detail=f"{kind} id already exists") from error
+
+@router.post("/{course_id}/modules", response_model=Module)
+async def add_module(course_id: str, module: Module):
+    # Ids are client-suppliable; a duplicate would make every `modules.$[m]` update hit both
+    try:
+        await modify_course(
+            course_id, {"modules.id": {"$ne": module.id}}, {"$push": {"modules": module.dict()}}, refresh_rollups=True
+        )
+    except HTTPException as e:
+        if e.status_code == 404:
+            await raise_if_id_taken(e, {"_id": ObjectId(course_id), "modules.id": module.id}, "Module")
+        raise
+    return module
+
+@router.put("/{course_id}/modules/order", response_model=OrderUpdate)
+async def reorder_modules(course_id: str, order: OrderUpdate):
+    await modify_course(
+        course_id,
+        {"modules.id": same_ids(order.ids), "modules": {"$size": len(order.ids)}},
+        [{"$set": {"modules": reorder("$modules", order.ids), "updated_at": datetime.utcnow()}}],
+    )
+    return order
+
+@router.patch("/{course_id}/modules/{module_id}", response_model=Module)
+async def update_module(course_id: str, module_id: str, update: ModuleUpdate):
+    fields = update.dict(exclude_unset=True)
+    if not fields:
+        raise HTTPException(status_code=400, detail="No update fields provided")
+    course = await modify_course(
+        course_id,
+        {"modules.id": module_id},
+        {"$set": {f"modules.$[m].{k}": v for k, v in fields.items()}},
+        array_filters=[{"m.id": module_id}],
+        projection={"modules": {"$elemMatch": {"id": module_id}}},
+    )
+    return course["modules"][0]
+
+@router.delete("/{course_id}/modules/{module_id}", response_model=dict)
+async def delete_module(course_id: str, module_id: str):
+    await modify_course(
+        course_id, {"modules.id": module_id}, {"$pull": {"modules": {"id": module_id}}}, refresh_rollups=True
+    )
+    return {"message": "Module deleted successfully"}
+
+@router.post("/{course_id}/modules/{module_id}/lessons", response_model=Lesson)
+async def add_lesson(course_id: str, module_id: str, lesson: Lesson):
+    try:
+        await modify_course(
+            course_id,
+            {"modules": {"$elemMatch": {"id": module_id, "lessons.id": {"$ne": lesson.id}}}},
+            {"$push": {"modules.$[m].lessons": lesson.dict()}},
+            array_filters=[{"m.id": module_id}],
+            refresh_rollups=True,
+        )
+    except HTTPException as e:
+        if e.status_code == 404:
+            await raise_if_id_taken(
+                e, {"_id": ObjectId(course_id), "modules": {"$elemMatch": {"id": module_id, "lessons.id": lesson.id}}}, "Lesson"
+            )
+        raise
+    return lesson
+
+@router.put("/{course_id}/modules/{module_id}/lessons/order", response_model=OrderUpdate)
+async def reorder_lessons(course_id: str, module_id: str, order: OrderUpdate):
+    modules = {
+        "$map": {
+            "input": "$modules",
+            "as": "m",
+            "in": {
+                "$cond": [
+                    {"$eq": ["$$m.id", module_id]},
+                    {"$mergeObjects": ["$$m", {"lessons": reorder("$$m.lessons", order.ids)}]},
+                    "$$m",
+                ]
+            },
+        }
+    }
+    await modify_course(
+        course_id,
+        {"modules": {"$elemMatch": {"id": module_id, "lessons.id": same_ids(order.ids), "lessons": {"$size": len(order.ids)}}}},
+        [{"$set": {"modules": modules, "updated_at": datetime.utcnow()}}],
+    )
+    return order
+
+@router.patch("/{course_id}/modules/{module_id}/lessons/{lesson_id}", response_model=Lesson)
+async def update_lesson(course_id: str, module_id: str, lesson_id: str, update: LessonUpdate):
+    fields = update.dict(exclude_unset=True)
+    if not fields:
+        raise HTTPException(status_code=400, detail="No update fields provided")
+    course = await modify_course(
+        course_id,
+        {"modules": {"$elemMatch": {"id": module_id, "lessons.id": lesson_id}}},
+        {"$set": {f"modules.$[m].lessons.$[l].{k}": v for k, v in fields.items()}},
+        array_filters=[{"m.id": module_id}, {"l.id": lesson_id}],
+        projection={"modules": {"$elemMatch": {"id": module_id}}},
+        refresh_rollups="duration" in fields,
+    )
+    return next(lesson for lesson in course["modules"][0]["lessons"] if lesson.get("id") == lesson_id)
+
+@router.delete("/{course_id}/modules/{module_id}/lessons/{lesson_id}", response_model=dict)
+async def delete_lesson(course_id: str, module_id: str, lesson_id: str):
+    await modify_course(
+        course_id,
+        {"modules": {"$elemMatch": {"id": module_id, "lessons.id": lesson_id}}},
+        {"$pull": {"modules.$[m].lessons": {"id": lesson_id}}},
+        array_filters=[{"m.id": module_id}],
+        refresh_rollups=True,
+    )
+    return {"message": "Lesson deleted successfully"}
+
+@router.put("/{course_id}/modules/{module_id}/quiz", response_model=Quiz)
+async def set_module_quiz(course_id: str, module_id: str, quiz: Quiz):
+    await modify_course(
+        course_id,
+        {"modules.id": module_id},
+        {"$set": {"modules.$[m].quiz": quiz.dict()}},
+        array_filters=[{"m.id": module_id}],
+        refresh_rollups=True,
+    )
+    return quiz
+
+@router.delete("/{course_id}/modules/{module_id}/quiz", response_model=dict)
+async def delete_module_quiz(course_id: str, module_id: str):
+    await modify_course(
+        course_id,
+        {"modules.id": module_id},
+        {"$set": {"modules.$[m].quiz": None}},
+        array_filters=[{"m.id": module_id}],
+        refresh_rollups=True,
+    )
+    return {"message": "Quiz deleted successfully"}
+
+@router.post("/{course_id}/modules/{module_id}/quiz/submissions", response_model=QuizGradeReport)
+async def submit_quiz_answers(course_id: str, module_id: str, batch: QuizSubmissionBatch):
+    """Grade a batch of submissions (e.g. a whole classroom) against the module's answer key."""
+    if len(batch.submissions) > MAX_QUIZ_SUBMISSIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_QUIZ_SUBMISSIONS} submissions per request")
+    if not ObjectId.is_valid(course_id):
+        raise HTTPException(status_code=400, detail="Invalid course ID")
+    key = await answer_keys.get(ObjectId(course_id), module_id)
+    if key is None:
+        raise HTTPException(status_code=404, detail="Course, module or quiz not found")
+    for index, submission in enumerate(batch.submissions):
+        if len(submission.answers) != len(key):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Submission {index} has {len(submission.answers)} answers, quiz has {len(key)} questions",
+            )
+    if not batch.submissions:
+        return QuizGradeReport(results=[])
+
+    graded = grade(key, [submission.answers for submission in batch.submissions])
+    attempts = [
+        {"student_id": submission.student_id, "answers": submission.answers, "score": score, "total": len(key)}
+        for submission, (score, _) in zip(batch.submissions, graded)
+    ]
+    attempt_ids = await save_attempts(ObjectId(course_id), module_id, attempts)
+    return QuizGradeReport(results=[
+        QuizResult(
+            student_id=submission.student_id,
+            attempt_id=str(attempt_id),
+            score=score,
+            total=len(key),
+            correct=correct,
+        )
+        for submission, (score, correct), attempt_id in zip(batch.submissions, graded, attempt_ids)
+    ])
+
 # ------------------ Utility ------------------ #
 
 def parse_course(course_dict) -> CourseInDB:
-    return CourseInDB(
-        id=str(course_dict["_id"]),
-        title=course_dict["title"],
-        description=course_dict["description"],
-        category=course_dict.get("category", "General"),
-        level=course_dict.get("level", "Beginner"),
-        status=course_dict.get("status", "draft"),
-        thumbnail_image=course_dict.get("thumbnail_image"),
-        created_at=course_dict["created_at"],
-        updated_at=course_dict["updated_at"],
-        student_count=course_dict.get("student_count", 0),
-        modules=course_dict.get("modules", [])
-    )
+    with stage("validation"):
+        return CourseInDB(
+            id=str(course_dict["_id"]),
+            title=course_dict["title"],
+            description=course_dict["description"],
+            category=course_dict.get("category", "General"),
+            level=course_dict.get("level", "Beginner"),
+            status=course_dict.get("status", "draft"),
+            thumbnail_image=course_dict.get("thumbnail_image"),
+            thumbnail_variants=course_dict.get("thumbnail_variants"),
+            brochure_url=course_dict.get("brochure_url"),
+            created_at=course_dict["created_at"],
+            updated_at=course_dict["updated_at"],
+            student_count=course_dict.get("student_count", 0),
+            rollup=course_dict.get("rollup"),
+            modules=course_dict.get("modules", [])
+        )
+
+# Trusted-read counterpart of parse_course: same keys and defaults, but plain
+# dicts for JSONBytesResponse instead of validated models.
+COURSE_SUMMARY_DEFAULTS = {
+    "title": None,
+    "description": None,
+    "category": "General",
+    "level": "Beginner",
+    "status": "draft",
+    "thumbnail_image": None,
+    "thumbnail_variants": None,
+    "brochure_url": None,
+    "created_at": None,
+    "updated_at": None,
+    "student_count": 0,
+    "rollup": None,
+}
+
+def course_summary_to_dict(course_dict) -> dict:
+    course = {"id": str(course_dict["_id"])}
+    for field, default in COURSE_SUMMARY_DEFAULTS.items():
+        course[field] = course_dict.get(field, default)
+    return course
+
+def course_to_dict(course_dict) -> dict:
+    course = course_summary_to_dict(course_dict)
+    course["modules"] = public_modules(course_dict.get("modules", []))
+    return course
@@ -0,0 +1,86 @@
+"""Production entry point: `python -m app.serve` (see start.sh).
+
+- WEB_CONCURRENCY workers, by default one per available core
+- uvloop and httptools when installed (both come with uvicorn[standard])
+- with gunicorn installed, the app is imported once and forked into the workers
+  (preload). The Mongo client, image/bcrypt pools and background tasks are all
+  created in the lifespan, i.e. in each worker after the fork.
+- `--reload` runs a single auto-reloading process for development
+"""
+import argparse
+import importlib.util
+import os
+
+from app.config import HOST, PORT, WEB_CONCURRENCY
+
+APP = "app.main:app"
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def default_workers() -> int:
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:  # not available on macOS / Windows
+        return max(1, os.cpu_count() or 1)
+
+
+def serve_gunicorn(host: str, port: int, workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    # uvicorn.workers is deprecated in favour of the separate uvicorn-worker package
+    worker_class = "uvicorn_worker.UvicornWorker" if installed("uvicorn_worker") else "uvicorn.workers.UvicornWorker"
+
+    class Application(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "worker_class": worker_class,
+                "preload_app": True,
+                "graceful_timeout": 30,
+                "keepalive": 5,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    Application().run()
+
+
+def serve_uvicorn(host: str, port: int, workers: int, reload: bool = False):
+    import uvicorn
+
+    uvicorn.run(
+        APP,
+        host=host,
+        port=port,
+        workers=None if reload else workers,
+        reload=reload,
+        loop="uvloop" if installed("uvloop") else "asyncio",
+        http="httptools" if installed("httptools") else "h11",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY or default_workers())
+    parser.add_argument("--reload", action="store_true", help="single auto-reloading process (development)")
+    args = parser.parse_args()
+
+    if not args.reload and installed("gunicorn") and os.name != "nt":
+        serve_gunicorn(args.host, args.port, args.workers)
+    else:
+        # uvicorn's own workers are spawned and each import the app themselves
+        serve_uvicorn(args.host, args.port, args.workers, reload=args.reload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Reference counting for content-addressed uploads (see app/services/storage.py)
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+from pymongo import UpdateOne
+
+from app.config import UPLOAD_DIR
+from app.database.mongo import blob_collection
+from app.services.storage import STATIC_PREFIX, blob_digest
+
+
+def course_blob_urls(course_dict: Optional[dict]) -> set:
+    """Content-addressed files a course document points at."""
+    if not course_dict:
+        return set()
+    urls = set((course_dict.get("thumbnail_variants") or {}).values())
+    urls.add(course_dict.get("thumbnail_image"))
+    urls.add(course_dict.get("brochure_url"))
+    return {url for url in urls if blob_digest(url)}
+
+
+def asset_blob_urls(asset: Optional[dict]) -> set:
+    """Content-addressed files an uploaded asset record points at."""
+    if not asset:
+        return set()
+    urls = set((asset.get("variants") or {}).values())
+    urls.add(asset.get("url"))
+    return {url for url in urls if blob_digest(url)}
+
+
+async def acquire_blobs(urls: Iterable[str]):
+    """Add one reference per occurrence: pass a URL once for every document that points at it."""
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne(
+            {"_id": blob_digest(url)},
+            {"$inc": {"refs": count}, "$setOnInsert": {"url": url, "created_at": now}},
+            upsert=True,
+        )
+        for url, count in Counter(urls).items()
+    ]
+    if ops:
+        await blob_collection.bulk_write(ops, ordered=False)
+
+
+async def release_blobs(urls: Iterable[str]):
+    """Drop one reference from each file and delete those nothing points at any more."""
+    urls = list(urls)
+    if not urls:
+        return
+    digests = [blob_digest(url) for url in urls]
+    await blob_collection.update_many({"_id": {"$in": digests}}, {"$inc": {"refs": -1}})
+    async for blob in blob_collection.find({"_id": {"$in": digests}, "refs": {"$lte": 0}}):
+        result = await blob_collection.delete_one({"_id": blob["_id"], "refs": {"$lte": 0}})
+        if result.deleted_count:
+            path = os.path.join(UPLOAD_DIR, blob["url"][len(STATIC_PREFIX):])
+            if os.path.exists(path):
+                os.remove(path)
+
+
+async def swap_blobs(old_urls: set, new_urls: set):
+    # Acquire first so re-submitting the same file never drops it to zero refs
+    await acquire_blobs(new_urls - old_urls)
+    await release_blobs(old_urls - new_urls)
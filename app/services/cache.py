@@ -0,0 +1,129 @@
+# Read-through cache for single-document lookups, keyed by collection and _id
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS
+
+
+class CacheBackend(ABC):
+    """Storage interface behind DocumentCache; implement it to plug in a shared cache."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    async def clear(self):
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class LRUCache(CacheBackend):
+    """In-process LRU with a per-entry TTL and a cap on the number of entries."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "lru",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def cache_key(collection_name: str, _id) -> str:
+    return f"{collection_name}:{_id}"
+
+
+class DocumentCache:
+    """Read-through `find_one` by _id; write paths must call `invalidate`."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.invalidations = 0
+        self.listeners = []
+
+    def on_invalidate(self, listener):
+        """Call `listener(collection_name, _id)` on every invalidation, e.g. to drop derived data."""
+        self.listeners.append(listener)
+
+    async def find_one(self, collection, _id) -> Optional[dict]:
+        key = cache_key(collection.name, _id)
+        doc = await self.backend.get(key)
+        if doc is None:
+            generation = self.invalidations
+            doc = await collection.find_one({"_id": _id})
+            if doc is None:
+                return None
+            # Don't cache a read that raced with a write; it may be the pre-write version
+            if generation == self.invalidations:
+                await self.backend.set(key, doc)
+        # Callers may rename/pop top-level keys; never hand out the cached dict itself
+        return dict(doc)
+
+    async def invalidate(self, collection_name: str, _id):
+        self.invalidations += 1
+        await self.backend.delete(cache_key(collection_name, _id))
+        for listener in self.listeners:
+            listener(collection_name, _id)
+
+    def stats(self) -> dict:
+        return {**self.backend.stats(), "invalidations": self.invalidations}
+
+
+document_cache = DocumentCache(LRUCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS))
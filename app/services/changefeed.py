@@ -0,0 +1,171 @@
+# Change feed: Mongo change streams (or updated_at polling) -> cache invalidation + live subscribers
+import asyncio
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.config import CHANGE_FEED_QUEUE_SIZE, CHANGE_POLL_SECONDS
+from app.database.mongo import profile_collection, courses_collection, teacher_course_collection
+from app.services.cache import document_cache
+
+# collection -> field the polling fallback watches. Polling cannot see deletes, nor writes
+# that leave this field alone: the student_count flush (app/services/counters.py) doesn't
+# bump updated_at, so with polling other workers serve cached counts for up to
+# CACHE_TTL_SECONDS. Rollup refreshes do bump it.
+WATCHED = {
+    teacher_course_collection: "updated_at",
+    courses_collection: "createdAt",
+    profile_collection: "updated_at",
+}
+OPERATIONS = ["insert", "update", "replace", "delete"]
+# "The $changeStream stage is only supported on replica sets"
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+
+class Subscription:
+    """One live consumer (an SSE client); dropped rather than buffered without bound if it falls behind."""
+
+    def __init__(self, collection: Optional[str], ids: Optional[Set[str]]):
+        self.collection = collection
+        self.ids = ids
+        self.queue = asyncio.Queue(maxsize=CHANGE_FEED_QUEUE_SIZE)
+        self.closed = False
+
+    def wants(self, event: dict) -> bool:
+        if self.collection and event["collection"] != self.collection:
+            return False
+        return not self.ids or event["id"] in self.ids
+
+    def offer(self, event: Optional[dict]):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            # Wake the reader; it stops at the None
+            if self.queue.full():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class ChangeFeed:
+    def __init__(self):
+        self.subscriptions: Set[Subscription] = set()
+        self.modes: Dict[str, str] = {}
+        self.events = 0
+        self.started_at = None
+        self._tasks = []
+
+    def start(self):
+        # Polling starts from here; Mongo keeps milliseconds, so don't start ahead of stored values
+        now = datetime.utcnow()
+        self.started_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        for collection, poll_field in WATCHED.items():
+            self._tasks.append(asyncio.create_task(self._follow(collection, poll_field)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for subscription in list(self.subscriptions):
+            subscription.close()
+
+    def subscribe(self, collection: Optional[str] = None, ids: Optional[Set[str]] = None) -> Subscription:
+        subscription = Subscription(collection, ids)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions.discard(subscription)
+        subscription.close()
+
+    async def publish(self, collection_name: str, operation: str, _id, updated_at=None):
+        # Writes from this worker already invalidated locally; this covers the other workers
+        await document_cache.invalidate(collection_name, _id)
+        self.events += 1
+        event = {
+            "collection": collection_name,
+            "operation": operation,
+            "id": str(_id),
+            "updated_at": updated_at.isoformat() if isinstance(updated_at, datetime) else None,
+        }
+        for subscription in list(self.subscriptions):
+            if subscription.wants(event):
+                subscription.offer(event)
+                if subscription.closed:
+                    self.subscriptions.discard(subscription)
+
+    async def _follow(self, collection, poll_field: str):
+        resume_token = None
+        while True:
+            try:
+                self.modes[collection.name] = "change_stream"
+                # Only the key and timestamp are needed, never the (possibly large) document itself
+                async with collection.watch(
+                    [
+                        {"$match": {"operationType": {"$in": OPERATIONS}}},
+                        {"$project": {
+                            "operationType": 1,
+                            "documentKey": 1,
+                            f"fullDocument.{poll_field}": 1,
+                            f"updateDescription.updatedFields.{poll_field}": 1,
+                        }},
+                    ],
+                    resume_after=resume_token,
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        # Inserts and replaces carry fullDocument; updates only the fields they set
+                        document = change.get("fullDocument") or (change.get("updateDescription") or {}).get("updatedFields") or {}
+                        await self.publish(
+                            collection.name,
+                            change["operationType"],
+                            change["documentKey"]["_id"],
+                            document.get(poll_field),
+                        )
+            except asyncio.CancelledError:
+                raise
+            except (OperationFailure, TypeError, NotImplementedError) as e:
+                if isinstance(e, OperationFailure) and e.code != CHANGE_STREAMS_UNSUPPORTED:
+                    print(f"Change stream on {collection.name} failed, reopening: {e}")
+                    resume_token = None
+                    await asyncio.sleep(CHANGE_POLL_SECONDS)
+                    continue
+                # No change streams on this deployment
+                await self._poll(collection, poll_field)
+                return
+            except PyMongoError as e:
+                print(f"Change stream on {collection.name} interrupted, resuming: {e}")
+                await asyncio.sleep(CHANGE_POLL_SECONDS)
+
+    async def _poll(self, collection, poll_field: str):
+        self.modes[collection.name] = "polling"
+        watermark = self.started_at
+        while True:
+            await asyncio.sleep(CHANGE_POLL_SECONDS)
+            try:
+                changed = collection.find(
+                    {poll_field: {"$gt": watermark}}, {poll_field: 1}
+                ).sort(poll_field, 1)
+                async for doc in changed:
+                    watermark = max(watermark, doc[poll_field])
+                    await self.publish(collection.name, "update", doc["_id"], doc[poll_field])
+            except PyMongoError as e:
+                print(f"Polling {collection.name} for changes failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscriptions),
+            "events": self.events,
+            **{f"{name}_polling": int(mode == "polling") for name, mode in self.modes.items()},
+        }
+
+
+change_feed = ChangeFeed()
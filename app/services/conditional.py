@@ -0,0 +1,55 @@
+# Conditional GET: ETags and If-None-Match -> 304 before any serialization work
+import hashlib
+from functools import cached_property
+from typing import Any, Callable
+
+from fastapi import Request
+from starlette.responses import Response
+
+from app.services.serialization import JSONBytesResponse, dumps
+
+
+def _etag(data: bytes) -> str:
+    return '"' + hashlib.blake2b(data, digest_size=12).hexdigest() + '"'
+
+
+def version_etag(doc: dict, *variant: str) -> str:
+    """Strong ETag from `_id` + `updated_at`; `variant` separates different views of one document."""
+    updated_at = doc.get("updated_at")
+    version = updated_at.isoformat() if updated_at else ""
+    return _etag(":".join((str(doc["_id"]), version, *variant)).encode())
+
+
+def content_etag(body: bytes) -> str:
+    """For documents without `updated_at`: hash the serialized body itself."""
+    return _etag(body)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2); compressed responses carry the W/ form
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class Representation:
+    """An ETag plus a body that is serialized at most once, however many responses share it."""
+
+    def __init__(self, etag: str, build: Callable[[], Any]):
+        self.etag = etag
+        self._build = build
+
+    @cached_property
+    def body(self) -> bytes:
+        return dumps(self._build())
+
+
+def conditional_response(request: Request, representation: Representation) -> Response:
+    """304 if the client already has the representation's ETag, otherwise its body."""
+    headers = {"ETag": representation.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, representation.etag):
+        return Response(status_code=304, headers=headers)
+    return JSONBytesResponse(representation.body, headers=headers)
@@ -0,0 +1,91 @@
+# Write-behind counters: increments are summed in memory and flushed as one batched $inc bulk write
+import asyncio
+import time
+from collections import defaultdict
+
+from pymongo import UpdateOne
+
+from app.config import ENROLLMENT_FLUSH_SECONDS
+from app.database.mongo import teacher_course_collection
+from app.services.cache import document_cache
+
+
+class WriteBehindCounter:
+    """Accumulates `$inc`s per document so a popular course is written once per interval, not per event.
+
+    Counts are at most `interval` seconds stale; `stop()` flushes whatever is pending. Flushes
+    leave updated_at alone, so the change feed's polling fallback doesn't see them.
+    """
+
+    def __init__(self, collection, field: str, interval: float):
+        self.collection = collection
+        self.field = field
+        self.interval = interval
+        self._pending = defaultdict(int)
+        self._task = None
+        self.flushes = 0
+        self.flushed_increments = 0
+        self.failures = 0
+        self.last_flush = None
+
+    def add(self, _id, delta: int = 1):
+        self._pending[_id] += delta
+
+    async def flush(self):
+        pending, self._pending = self._pending, defaultdict(int)
+        ops = [UpdateOne({"_id": _id}, {"$inc": {self.field: delta}}) for _id, delta in pending.items() if delta]
+        if not ops:
+            return
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+        except Exception as e:
+            # Put the deltas back so the next flush retries them
+            self._restore(pending)
+            self.failures += 1
+            print(f"Error flushing {self.collection.name}.{self.field} counters: {e}")
+            return
+        except BaseException:
+            # Cancelled mid-write (e.g. by stop()): keep the deltas for the final flush
+            self._restore(pending)
+            raise
+        for _id in pending:
+            await document_cache.invalidate(self.collection.name, _id)
+        self.flushes += 1
+        self.flushed_increments += sum(pending.values())
+        self.last_flush = time.time()
+
+    def _restore(self, pending: dict):
+        for _id, delta in pending.items():
+            self._pending[_id] += delta
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending_documents": len(self._pending),
+            "pending_increments": sum(self._pending.values()),
+            "flushes": self.flushes,
+            "flushed_increments": self.flushed_increments,
+            "failures": self.failures,
+            "last_flush": self.last_flush,
+        }
+
+
+student_counter = WriteBehindCounter(teacher_course_collection, "student_count", ENROLLMENT_FLUSH_SECONDS)
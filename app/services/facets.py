@@ -0,0 +1,112 @@
+# Materialized category/level/status counts for teacher courses, kept in one catalog_stats document
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+from app.config import FACETS_RECOMPUTE_SECONDS
+from app.database.mongo import stats_collection, teacher_course_collection
+
+FACETS_ID = "teacher_course_facets"
+# Same defaults the course serializers fill in for missing fields
+FACET_DEFAULTS = {"category": "General", "level": "Beginner", "status": "draft"}
+
+
+def _encode(value) -> str:
+    # Facet values become field names; Mongo reserves "." and a leading "$"
+    value = str(value).replace(".", "．")
+    return "＄" + value[1:] if value.startswith("$") else value
+
+
+def _decode(key: str) -> str:
+    key = key.replace("．", ".")
+    return "$" + key[1:] if key.startswith("＄") else key
+
+
+def facet_delta(course: Optional[dict], sign: int) -> Counter:
+    if not course:
+        return Counter()
+    delta = Counter({"total": sign})
+    for field, default in FACET_DEFAULTS.items():
+        # Only a missing/null value takes the default, as $ifNull does in recompute()
+        value = course.get(field)
+        delta[f"{field}.{_encode(default if value is None else value)}"] += sign
+    return delta
+
+
+class CatalogFacets:
+    """Counts are $inc'ed by the write handlers; `recompute` rebuilds them from the collection.
+
+    A recompute racing an incremental update can be off by that update until the next run,
+    which is the staleness FACETS_RECOMPUTE_SECONDS bounds.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task = None
+
+    async def apply(self, before: Iterable[dict] = (), after: Iterable[dict] = ()):
+        """Move counts from the `before` versions of courses to their `after` versions in one write."""
+        delta = Counter()
+        for course in before:
+            delta.update(facet_delta(course, -1))
+        for course in after:
+            delta.update(facet_delta(course, 1))
+        inc = {key: value for key, value in delta.items() if value}
+        if inc:
+            await stats_collection.update_one(
+                {"_id": FACETS_ID}, {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}}, upsert=True
+            )
+
+    async def recompute(self) -> dict:
+        pipeline = [{"$facet": {
+            field: [{"$group": {"_id": {"$ifNull": [f"${field}", default]}, "count": {"$sum": 1}}}]
+            for field, default in FACET_DEFAULTS.items()
+        }}]
+        result = (await teacher_course_collection.aggregate(pipeline).to_list(1))[0]
+        now = datetime.utcnow()
+        doc = {"updated_at": now, "recomputed_at": now}
+        for field in FACET_DEFAULTS:
+            doc[field] = {_encode(group["_id"]): group["count"] for group in result[field]}
+        doc["total"] = sum(doc["status"].values())
+        await stats_collection.replace_one({"_id": FACETS_ID}, doc, upsert=True)
+        return {"_id": FACETS_ID, **doc}
+
+    async def get(self) -> dict:
+        doc = await stats_collection.find_one({"_id": FACETS_ID})
+        if doc is None:
+            doc = await self.recompute()
+        facets = {
+            field: {_decode(key): count for key, count in (doc.get(field) or {}).items() if count > 0}
+            for field in FACET_DEFAULTS
+        }
+        return {
+            **facets,
+            "total": doc.get("total", 0),
+            "updated_at": doc.get("updated_at"),
+            "recomputed_at": doc.get("recomputed_at"),
+        }
+
+    async def _run(self):
+        while True:
+            try:
+                await self.recompute()
+            except Exception as e:
+                print(f"Error recomputing catalog facets: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+catalog_facets = CatalogFacets(FACETS_RECOMPUTE_SECONDS)
@@ -0,0 +1,42 @@
+# Sparse fieldsets: `?fields=a,b,c` validated against a response model and pushed down as a projection
+from typing import Iterable, List, Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, create_model
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """Requested field names in order (always including `id`), or None for the whole document."""
+    if not fields:
+        return None
+    requested = []
+    for name in fields.split(","):
+        name = name.strip()
+        if name and name not in requested:
+            requested.append(name)
+    unknown = [name for name in requested if name not in model.__fields__]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+
+def fields_projection(fields: List[str], always: Iterable[str] = ()) -> dict:
+    """Mongo projection for `fields`; `always` adds fields the handler needs internally (e.g. cursors)."""
+    projection = {name: 1 for name in fields if name != "id"}
+    for name in always:
+        projection[name] = 1
+    return projection
+
+
+def select_fields(doc: dict, fields: List[str]) -> dict:
+    return {name: doc.get(name) for name in fields}
+
+
+def partial_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Copy of `model` with every field optional, for documenting `?fields=` responses."""
+    return create_model(
+        f"Partial{model.__name__}",
+        **{name: (Optional[field.annotation], None) for name, field in model.__fields__.items()},
+    )
@@ -0,0 +1,112 @@
+# Server-side quiz grading against answer keys kept in memory per course
+from collections import OrderedDict
+from datetime import datetime
+from operator import eq
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.config import ANSWER_KEY_MAX_COURSES
+from app.database.mongo import quiz_attempt_collection, teacher_course_collection
+from app.services.cache import document_cache
+
+# Only the answer keys are read, never lesson bodies or question text
+ANSWER_KEY_PROJECTION = {"modules.id": 1, "modules.quiz.questions.correct_answer": 1}
+
+
+def public_modules(modules: List[dict]) -> List[dict]:
+    """Modules with `correct_answer` removed from every quiz question (stored documents are untouched)."""
+    public = []
+    for module in modules:
+        quiz = module.get("quiz")
+        if quiz:
+            questions = [
+                {k: v for k, v in question.items() if k != "correct_answer"}
+                for question in quiz.get("questions") or []
+            ]
+            module = {**module, "quiz": {**quiz, "questions": questions}}
+        public.append(module)
+    return public
+
+
+def restore_answer_keys(modules: List[dict], keys: Dict[str, Tuple[int, ...]]) -> List[str]:
+    """Fill omitted `correct_answer`s from the stored keys, matching questions by module id and position.
+
+    Lets a course read back without its answer keys be saved again unchanged. Returns a
+    description of every question that has no answer and no stored key to fall back on.
+    """
+    missing = []
+    for module in modules:
+        stored = keys.get(module.get("id")) or ()
+        for index, question in enumerate((module.get("quiz") or {}).get("questions") or []):
+            if question.get("correct_answer") is not None:
+                continue
+            if index < len(stored) and stored[index] is not None:
+                question["correct_answer"] = stored[index]
+            else:
+                missing.append(f"module {module.get('id')} question {index}")
+    return missing
+
+
+class AnswerKeyIndex:
+    """course_id -> {module_id: answer key tuple}, loaded once per course and dropped on invalidation."""
+
+    def __init__(self, max_courses: int):
+        self.max_courses = max_courses
+        self._keys: "OrderedDict[ObjectId, Dict[str, Tuple[int, ...]]]" = OrderedDict()
+        self.loads = 0
+        document_cache.on_invalidate(self._invalidate)
+
+    def _invalidate(self, collection_name: str, _id):
+        if collection_name == teacher_course_collection.name:
+            self._keys.pop(_id, None)
+
+    async def get(self, course_id: ObjectId, module_id: str) -> Optional[Tuple[int, ...]]:
+        """Answer key for one module's quiz; None if the course, module or quiz doesn't exist."""
+        keys = await self.course(course_id)
+        return keys.get(module_id) if keys is not None else None
+
+    async def course(self, course_id: ObjectId) -> Optional[Dict[str, Tuple[int, ...]]]:
+        """Answer keys of every quiz in a course by module id; None if the course doesn't exist."""
+        keys = self._keys.get(course_id)
+        if keys is None:
+            generation = document_cache.invalidations
+            course = await teacher_course_collection.find_one({"_id": course_id}, ANSWER_KEY_PROJECTION)
+            if course is None:
+                return None
+            keys = {
+                module.get("id"): tuple(q.get("correct_answer") for q in (module.get("quiz") or {}).get("questions") or [])
+                for module in course.get("modules") or []
+                if module.get("quiz")
+            }
+            self.loads += 1
+            # Same rule as DocumentCache: don't keep a load that raced with a write
+            if generation == document_cache.invalidations:
+                self._keys[course_id] = keys
+                if len(self._keys) > self.max_courses:
+                    self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(course_id)
+        return keys
+
+    def stats(self) -> dict:
+        return {"courses": len(self._keys), "loads": self.loads}
+
+
+def grade(key: Tuple[int, ...], submissions: List[List[Optional[int]]]) -> List[Tuple[int, List[bool]]]:
+    """Score a whole batch against one key: (score, per-question correctness) per submission."""
+    results = []
+    for answers in submissions:
+        correct = list(map(eq, answers, key))
+        results.append((sum(correct), correct))
+    return results
+
+
+async def save_attempts(course_id: ObjectId, module_id: str, attempts: List[dict]) -> List[ObjectId]:
+    now = datetime.utcnow()
+    docs = [{"course_id": course_id, "module_id": module_id, "submitted_at": now, **attempt} for attempt in attempts]
+    result = await quiz_attempt_collection.insert_many(docs, ordered=False)
+    return result.inserted_ids
+
+
+answer_keys = AnswerKeyIndex(ANSWER_KEY_MAX_COURSES)
@@ -0,0 +1,149 @@
+# Thumbnail decoding/resizing, run in a process pool off the event loop
+import asyncio
+import base64
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict
+
+from fastapi import HTTPException
+
+from app.config import (
+    IMAGE_QUEUE_LIMIT,
+    IMAGE_WORKERS,
+    THUMBNAIL_DEFAULT_WIDTH,
+    THUMBNAIL_FORMAT,
+    THUMBNAIL_WIDTHS,
+    UPLOAD_DIR,
+)
+from app.services.storage import store_bytes
+
+# Pillow is only imported where images are decoded, i.e. inside the pool's worker
+# processes; the web workers themselves never load it.
+if TYPE_CHECKING:
+    from PIL import Image
+
+FORMAT_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+# ------------------ Worker side ------------------ #
+
+def decode_data_url(thumbnail_image: str) -> "Image.Image":
+    from PIL import Image
+
+    try:
+        header, encoded = thumbnail_image.split(",", 1)
+        image = Image.open(BytesIO(base64.b64decode(encoded)))
+        image.load()
+    except Exception as e:
+        raise InvalidImage(str(e))
+    return image
+
+
+def render_variants(image: "Image.Image", upload_dir: str) -> Dict[str, str]:
+    """Store one resized copy of `image` per configured width and return their URLs."""
+    if THUMBNAIL_FORMAT == "jpeg" or image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB" if THUMBNAIL_FORMAT == "jpeg" else "RGBA")
+
+    ext = FORMAT_EXTENSIONS[THUMBNAIL_FORMAT]
+    variants = {}
+    for width in THUMBNAIL_WIDTHS:
+        variant = image.copy()
+        variant.thumbnail((width, width))
+        buf = BytesIO()
+        variant.save(buf, THUMBNAIL_FORMAT.upper(), quality=82)
+        variants[str(width)] = store_bytes(buf.getvalue(), ext, upload_dir)
+    return variants
+
+
+def render_thumbnail(thumbnail_image: str, upload_dir: str) -> Dict[str, str]:
+    return render_variants(decode_data_url(thumbnail_image), upload_dir)
+
+
+def render_thumbnail_file(path: str, upload_dir: str) -> Dict[str, str]:
+    from PIL import Image
+
+    try:
+        image = Image.open(path)
+        image.load()
+    except Exception as e:
+        raise InvalidImage(str(e))
+    return render_variants(image, upload_dir)
+
+
+# ------------------ Executor ------------------ #
+
+class ImageExecutor:
+    """Process pool with a bounded number of queued jobs; sheds load with 503 when full."""
+
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: never fork the Motor client's background threads into workers
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_workers + self.queue_limit:
+            raise HTTPException(
+                status_code=503,
+                detail="Image processing is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), functools.partial(fn, *args))
+        except BrokenProcessPool:
+            self._pool = None
+            raise HTTPException(status_code=503, detail="Image processing is unavailable, please retry")
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+image_executor = ImageExecutor(IMAGE_WORKERS, IMAGE_QUEUE_LIMIT)
+
+
+async def save_thumbnail(thumbnail_image: str) -> Dict[str, str]:
+    """Resize a `data:image/...;base64,` upload into every variant; returns {width: url}."""
+    if not thumbnail_image.startswith("data:image/"):
+        raise HTTPException(status_code=400, detail="Invalid image format")
+
+    try:
+        return await image_executor.run(render_thumbnail, thumbnail_image, UPLOAD_DIR)
+    except InvalidImage as e:
+        raise HTTPException(status_code=400, detail=f"Invalid base64 image: {str(e)}")
+
+
+async def save_thumbnail_file(path: str) -> Dict[str, str]:
+    """Same as save_thumbnail, for an image that has already been streamed to disk."""
+    try:
+        return await image_executor.run(render_thumbnail_file, path, UPLOAD_DIR)
+    except InvalidImage as e:
+        raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
+
+
+def default_variant(variants: Dict[str, str]) -> str:
+    return variants.get(str(THUMBNAIL_DEFAULT_WIDTH)) or next(iter(variants.values()))
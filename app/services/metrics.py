@@ -0,0 +1,279 @@
+# Request / Mongo command instrumentation and Prometheus text rendering
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from pymongo import monitoring
+
+from app.config import SLOW_REQUEST_MS
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class LabeledHistogram:
+    """Histograms keyed by a tuple of label values; safe to observe from Motor's threads."""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series: Dict[tuple, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            histogram = self.series.get(labels)
+            if histogram is None:
+                histogram = self.series[labels] = Histogram()
+            histogram.observe(value)
+
+
+class LabeledCounter:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], kind: str = "counter"):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.kind = kind
+        self.series: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, value: float = 1):
+        with self._lock:
+            self.series[labels] = self.series.get(labels, 0) + value
+
+
+request_latency = LabeledHistogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+requests_in_flight = LabeledCounter(
+    "http_requests_in_flight", "Requests currently being handled", ("route",), kind="gauge"
+)
+mongo_command_latency = LabeledHistogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ("collection", "command")
+)
+mongo_command_documents = LabeledCounter(
+    "mongo_command_documents_total", "Documents returned or affected by MongoDB commands", ("collection", "command")
+)
+mongo_command_failures = LabeledCounter(
+    "mongo_command_failures_total", "Failed MongoDB commands", ("collection", "command")
+)
+singleflight_calls = LabeledCounter(
+    "singleflight_calls_total", "Coalesced reads by outcome (leader, coalesced, error, timeout)", ("name", "role")
+)
+
+# ------------------ Per-request time breakdown ------------------ #
+
+class RequestTiming:
+    def __init__(self):
+        self.stages = {"db": 0.0, "validation": 0.0, "serialization": 0.0}
+
+    def add(self, stage_name: str, seconds: float):
+        self.stages[stage_name] = self.stages.get(stage_name, 0.0) + seconds
+
+
+# Motor copies the context into its executor threads, so the command listener sees this too
+current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("current_timing", default=None)
+
+
+@contextmanager
+def stage(stage_name: str):
+    """Attribute the enclosed time to `stage_name` in the current request's breakdown."""
+    timing = current_timing.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(stage_name, time.perf_counter() - start)
+
+
+# ------------------ Mongo commands ------------------ #
+
+def _reply_documents(reply) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Records per-collection/per-command durations and document counts."""
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if not isinstance(target, str):  # getMore carries the cursor id here
+            target = event.command.get("collection", "")
+        self._collections[(event.connection_id, event.request_id)] = target
+
+    def succeeded(self, event):
+        labels = (self._collections.pop((event.connection_id, event.request_id), ""), event.command_name)
+        seconds = event.duration_micros / 1e6
+        mongo_command_latency.observe(labels, seconds)
+        mongo_command_documents.inc(labels, _reply_documents(event.reply))
+        timing = current_timing.get()
+        if timing is not None:
+            timing.add("db", seconds)
+
+    def failed(self, event):
+        labels = (self._collections.pop((event.connection_id, event.request_id), ""), event.command_name)
+        mongo_command_failures.inc(labels)
+        timing = current_timing.get()
+        if timing is not None:
+            timing.add("db", event.duration_micros / 1e6)
+
+
+command_metrics = CommandMetrics()
+
+# ------------------ ASGI middleware ------------------ #
+
+def _route_label(scope) -> str:
+    """Route template for the request, e.g. /teacher_courses/{course_id}, to keep label cardinality low."""
+    route = scope.get("route")
+    if route is None:
+        if scope.get("endpoint") is None:
+            return "unmatched"
+        return scope.get("root_path", "") + "/{path}"  # mounted app, e.g. /static
+    template = route.path
+    # Some FastAPI releases keep the include_router prefix out of route.path; the prefix is
+    # whatever the path has in front of the template's segments (never a path parameter)
+    segments = scope["path"].split("/")
+    extra = len(segments) - len(template.split("/"))
+    if extra > 0 and ":path}" not in template:
+        template = "/".join(segments[: extra + 1]) + template
+    return template
+
+
+async def track_in_flight(request: Request):
+    """App-wide dependency keeping the per-route in-flight gauge.
+
+    The middleware only learns the route once the request has been handled, so the gauge is
+    kept here, after routing. It covers API routes (not the /static mount) and a streamed
+    response stays in flight until its body ends.
+    """
+    labels = (_route_label(request.scope),)
+    requests_in_flight.inc(labels)
+    try:
+        yield
+    finally:
+        requests_in_flight.inc(labels, -1)
+
+
+class MetricsMiddleware:
+    """Per-route latency histograms and the opt-in slow-request log."""
+
+    def __init__(self, app, slow_request_ms: float = SLOW_REQUEST_MS):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_timing.reset(token)
+            route = _route_label(scope)
+            request_latency.observe((scope["method"], route, str(status)), elapsed)
+            if self.slow_request_ms and elapsed * 1000 >= self.slow_request_ms:
+                breakdown = " ".join(f"{k}={v * 1000:.1f}ms" for k, v in timing.stages.items())
+                logger.warning(
+                    "slow request: %s %s status=%s total=%.1fms %s",
+                    scope["method"], scope["path"], status, elapsed * 1000, breakdown,
+                )
+
+# ------------------ Prometheus text format ------------------ #
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [(name, value) for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _render_histogram(metric: LabeledHistogram, lines: list):
+    lines.append(f"# HELP {metric.name} {metric.help_text}")
+    lines.append(f"# TYPE {metric.name} histogram")
+    with metric._lock:
+        series = [(labels, list(h.counts), h.sum, h.count, h.buckets) for labels, h in metric.series.items()]
+    for labels, counts, total, count, buckets in series:
+        cumulative = 0
+        for bound, bucket_count in zip(buckets, counts):
+            cumulative += bucket_count
+            lines.append(f"{metric.name}_bucket{_labels(metric.label_names, labels, ('le', bound))} {cumulative}")
+        lines.append(f"{metric.name}_bucket{_labels(metric.label_names, labels, ('le', '+Inf'))} {count}")
+        lines.append(f"{metric.name}_sum{_labels(metric.label_names, labels)} {total}")
+        lines.append(f"{metric.name}_count{_labels(metric.label_names, labels)} {count}")
+
+
+def _render_counter(metric: LabeledCounter, lines: list):
+    lines.append(f"# HELP {metric.name} {metric.help_text}")
+    lines.append(f"# TYPE {metric.name} {metric.kind}")
+    with metric._lock:
+        series = list(metric.series.items())
+    for labels, value in series:
+        lines.append(f"{metric.name}{_labels(metric.label_names, labels)} {value}")
+
+
+def render_prometheus(gauges: Dict[str, Dict[str, float]] = None) -> str:
+    """Render all metrics; `gauges` adds plain numeric snapshots as `<prefix>_<key>` gauges."""
+    lines = []
+    _render_histogram(request_latency, lines)
+    _render_counter(requests_in_flight, lines)
+    _render_histogram(mongo_command_latency, lines)
+    _render_counter(mongo_command_documents, lines)
+    _render_counter(mongo_command_failures, lines)
+    _render_counter(singleflight_calls, lines)
+    for prefix, snapshot in (gauges or {}).items():
+        for key, value in snapshot.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {value}")
+    return "\n".join(lines) + "\n"
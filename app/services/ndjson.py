@@ -0,0 +1,24 @@
+# Newline-delimited JSON helpers
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+
+def _check_length(line: bytes, max_line_bytes: int):
+    if len(line) > max_line_bytes:
+        raise HTTPException(status_code=413, detail=f"Line exceeds {max_line_bytes} bytes")
+
+
+async def iter_lines(stream: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without holding more than one partial line in memory."""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            # A whole line can arrive within one chunk, so complete lines are checked too
+            _check_length(line, max_line_bytes)
+            yield line
+        _check_length(buffer, max_line_bytes)
+    if buffer:
+        yield buffer
@@ -0,0 +1,56 @@
+# Keyset (cursor) pagination helpers
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import DESCENDING
+
+
+def encode_cursor(doc: dict, sort_field: str) -> str:
+    """Build an opaque cursor pointing just after `doc` in (sort_field, _id) order."""
+    value = doc[sort_field]
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"t": value, "id": str(doc["_id"])})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Union[datetime, float], ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        value = payload["t"]
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, (int, float)):
+            raise ValueError(value)
+        return value, ObjectId(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(cursor: Optional[str], sort_field: str) -> dict:
+    if not cursor:
+        return {}
+    value, last_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "_id": {"$lt": last_id}},
+        ]
+    }
+
+
+def keyset_sort(sort_field: str) -> list:
+    return [(sort_field, DESCENDING), ("_id", DESCENDING)]
+
+
+def paginate(docs: List[dict], limit: int, sort_field: str) -> Tuple[List[dict], Optional[str]]:
+    """Trim a `limit + 1` fetch to `limit` docs and return the cursor for the next page."""
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1], sort_field)
+    return docs, None
@@ -0,0 +1,104 @@
+# bcrypt hashing/verification on a bounded thread pool (bcrypt releases the GIL)
+import asyncio
+import hmac
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+import bcrypt
+from fastapi import HTTPException
+
+from app.config import BCRYPT_ROUNDS, PASSWORD_HASH_QUEUE_LIMIT, PASSWORD_HASH_WORKERS
+
+
+def _hash(password: str, rounds: int) -> bytes:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds))
+
+
+def _verify(password: str, hashed: Union[bytes, str]) -> bool:
+    if isinstance(hashed, str):
+        if not hashed.startswith("$2"):
+            # Rows written before passwords were hashed
+            return hmac.compare_digest(password.encode("utf-8"), hashed.encode("utf-8"))
+        hashed = hashed.encode("utf-8")
+    return bcrypt.checkpw(password.encode("utf-8"), hashed)
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop with a concurrency cap and a bounded wait queue."""
+
+    def __init__(self, rounds: int, max_workers: int, queue_limit: int):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = None
+        self.pending = 0
+        self.running = 0
+        self.rejected = 0
+        self.completed = 0
+        self._latencies = deque(maxlen=1000)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use and again after shutdown(), so a lifespan can run more than once
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_workers + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many authentication requests, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), self._timed, fn, *args)
+        finally:
+            self.pending -= 1
+
+    def _timed(self, fn, *args):
+        self.running += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+            self.running -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: Union[bytes, str]) -> bool:
+        return await self._run(_verify, password, hashed)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2) if latencies else None
+
+        return {
+            "rounds": self.rounds,
+            "workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.running,
+            "queue_depth": max(0, self.pending - self.running),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_ms_p50": percentile(0.50),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": round(latencies[-1] * 1000, 2) if latencies else None,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
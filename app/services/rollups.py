@@ -0,0 +1,78 @@
+# Duration / lesson / quiz rollups stored on each course and module at write time
+import re
+from typing import List
+
+# apply_rollups and ROLLUP_REFRESH must agree on every input, so both use these rules:
+# a duration part counts only if it is 1-9 ASCII digits, a non-string duration is 0,
+# and a module has a quiz whenever `quiz` is present and not null.
+DURATION_PART = "[0-9]{1,9}"
+_DURATION_PART = re.compile(DURATION_PART)
+
+
+def duration_seconds(duration) -> int:
+    """"MM:SS" (or "H:MM:SS") to seconds; unparseable parts count as 0."""
+    if not isinstance(duration, str):
+        return 0
+    seconds = 0
+    for part in duration.split(":"):
+        seconds = seconds * 60 + (int(part) if _DURATION_PART.fullmatch(part) else 0)
+    return seconds
+
+
+def module_rollup(module: dict) -> dict:
+    lessons = module.get("lessons") or []
+    return {
+        "total_seconds": sum(duration_seconds(lesson.get("duration")) for lesson in lessons),
+        "lesson_count": len(lessons),
+        "quiz_count": 0 if module.get("quiz") is None else 1,
+    }
+
+
+def apply_rollups(modules: List[dict]) -> dict:
+    """Set `rollup` on every module dict in place and return the course-level rollup."""
+    course = {"total_seconds": 0, "lesson_count": 0, "quiz_count": 0}
+    for module in modules:
+        module["rollup"] = module_rollup(module)
+        for key in course:
+            course[key] += module["rollup"][key]
+    return course
+
+
+# Server-side equivalent of apply_rollups for in-place module/lesson/quiz edits. Appended
+# to pipeline updates it refreshes the rollups in the same write; operator updates with
+# array filters can't be pipelines, so those run it as a follow-up update.
+_LESSON_SECONDS = {
+    "$cond": [
+        {"$eq": [{"$type": "$$l.duration"}, "string"]},
+        {
+            "$reduce": {
+                "input": {"$split": ["$$l.duration", ":"]},
+                "initialValue": 0,
+                "in": {
+                    "$add": [
+                        {"$multiply": ["$$value", 60]},
+                        {"$cond": [{"$regexMatch": {"input": "$$this", "regex": rf"^{DURATION_PART}\z"}}, {"$toLong": "$$this"}, 0]},
+                    ]
+                },
+            }
+        },
+        0,
+    ]
+}
+
+ROLLUP_REFRESH = [
+    {"$set": {"modules": {"$map": {
+        "input": {"$ifNull": ["$modules", []]},
+        "as": "m",
+        "in": {"$mergeObjects": ["$$m", {"rollup": {
+            "total_seconds": {"$sum": {"$map": {"input": {"$ifNull": ["$$m.lessons", []]}, "as": "l", "in": _LESSON_SECONDS}}},
+            "lesson_count": {"$size": {"$ifNull": ["$$m.lessons", []]}},
+            "quiz_count": {"$cond": [{"$eq": [{"$ifNull": ["$$m.quiz", None]}, None]}, 0, 1]},
+        }}]},
+    }}}},
+    {"$set": {"rollup": {
+        "total_seconds": {"$sum": "$modules.rollup.total_seconds"},
+        "lesson_count": {"$sum": "$modules.rollup.lesson_count"},
+        "quiz_count": {"$sum": "$modules.rollup.quiz_count"},
+    }}},
+]
@@ -0,0 +1,35 @@
+# Fast JSON path for trusted database reads: Mongo documents -> JSON bytes via orjson
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from starlette.responses import Response
+
+from app.services.metrics import stage
+
+
+def _default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    # orjson handles datetime natively (ISO 8601, same as Pydantic's output)
+    with stage("serialization"):
+        return orjson.dumps(content, default=_default)
+
+
+class JSONBytesResponse(Response):
+    """JSON response that skips `response_model` validation and the stdlib encoder.
+
+    Only use it for documents read back from Mongo; request bodies are still
+    validated by their Pydantic models.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,54 @@
+# Single-flight: concurrent identical reads share one in-flight query and one serialized result
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from fastapi import HTTPException
+
+from app.config import SINGLE_FLIGHT_TIMEOUT
+from app.services.cache import document_cache
+from app.services.metrics import singleflight_calls
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key.
+
+    The first caller starts `fn()` as its own task and later callers with the same key await
+    that task, so one request disconnecting never cancels the query the others share. Results
+    and exceptions go to every waiter, so return immutable values (bytes, tuples).
+
+    A flight started before a write is not joined after it: like DocumentCache, a change in
+    `document_cache.invalidations` makes the next caller start a fresh query.
+    """
+
+    def __init__(self, name: str, timeout: float = SINGLE_FLIGHT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._inflight: Dict[Hashable, Tuple[int, asyncio.Task]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        generation = document_cache.invalidations
+        flight = self._inflight.get(key)
+        if flight is not None and flight[0] == generation:
+            singleflight_calls.inc((self.name, "coalesced"))
+            task = flight[1]
+        else:
+            singleflight_calls.inc((self.name, "leader"))
+            task = asyncio.ensure_future(self._run(fn))
+            self._inflight[key] = (generation, task)
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _run(self, fn):
+        try:
+            return await asyncio.wait_for(fn(), self.timeout)
+        except asyncio.TimeoutError:
+            singleflight_calls.inc((self.name, "timeout"))
+            raise HTTPException(status_code=504, detail="Database read timed out")
+
+    def _finish(self, key, task: asyncio.Task):
+        flight = self._inflight.get(key)
+        if flight is not None and flight[1] is task:
+            del self._inflight[key]
+        # Retrieving the exception also keeps asyncio from logging it when every waiter has gone
+        if not task.cancelled() and task.exception() is not None:
+            singleflight_calls.inc((self.name, "error"))
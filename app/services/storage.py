@@ -0,0 +1,79 @@
+# Content-addressed upload store: files are named by their sha256 and reference counted
+import hashlib
+import os
+import re
+import tempfile
+from typing import Optional
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+from app.config import UPLOAD_DIR
+
+STATIC_PREFIX = "/static/"
+BLOB_PATH_PATTERN = re.compile(r"^([0-9a-f]{2})/([0-9a-f]{2})/([0-9a-f]{64})\.[a-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# ------------------ Files ------------------ #
+
+def blob_relpath(digest: str, ext: str) -> str:
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{ext}"
+
+
+def blob_url(relpath: str) -> str:
+    return STATIC_PREFIX + relpath
+
+
+def blob_digest(url: Optional[str]) -> Optional[str]:
+    """sha256 of a content-addressed upload URL, or None for legacy/external URLs."""
+    if not url or not url.startswith(STATIC_PREFIX):
+        return None
+    match = BLOB_PATH_PATTERN.match(url[len(STATIC_PREFIX):])
+    return match.group(3) if match else None
+
+
+def store_file(path: str, digest: str, ext: str, upload_dir: str = UPLOAD_DIR) -> str:
+    """Move a fully written temp file into the store; a no-op if the content is already there."""
+    relpath = blob_relpath(digest, ext)
+    target = os.path.join(upload_dir, relpath)
+    if os.path.exists(target):
+        os.remove(path)
+    else:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+    return blob_url(relpath)
+
+
+def store_bytes(data: bytes, ext: str, upload_dir: str = UPLOAD_DIR) -> str:
+    digest = hashlib.sha256(data).hexdigest()
+    relpath = blob_relpath(digest, ext)
+    target = os.path.join(upload_dir, relpath)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+    return blob_url(relpath)
+
+
+# ------------------ Static serving ------------------ #
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles that marks content-addressed files as immutable with a hash ETag."""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        relpath = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        match = BLOB_PATH_PATTERN.match(relpath)
+        if not match:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        response.headers["etag"] = f'"{match.group(3)}"'
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
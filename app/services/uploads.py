@@ -0,0 +1,176 @@
+# Streaming multipart/form-data uploads, spooled to disk chunk by chunk
+import hashlib
+import os
+import tempfile
+from typing import Dict, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # older python-multipart releases
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from app.config import MAX_IMAGE_UPLOAD_SIZE, MAX_PDF_UPLOAD_SIZE, UPLOAD_TMP_DIR
+from app.database.mongo import asset_collection
+
+# Accepted content types -> (asset kind, size limit in bytes)
+UPLOAD_TYPES: Dict[str, tuple] = {
+    "image/png": ("image", MAX_IMAGE_UPLOAD_SIZE),
+    "image/jpeg": ("image", MAX_IMAGE_UPLOAD_SIZE),
+    "image/webp": ("image", MAX_IMAGE_UPLOAD_SIZE),
+    "image/gif": ("image", MAX_IMAGE_UPLOAD_SIZE),
+    "application/pdf": ("pdf", MAX_PDF_UPLOAD_SIZE),
+}
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+os.makedirs(UPLOAD_TMP_DIR, exist_ok=True)
+
+
+class StreamedUpload:
+    """A file part that has been written to a temp file on disk."""
+
+    def __init__(self, filename: str, content_type: str, kind: str, max_size: int):
+        self.filename = filename
+        self.content_type = content_type
+        self.kind = kind
+        self.max_size = max_size
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        fd, self.path = tempfile.mkstemp(dir=UPLOAD_TMP_DIR)
+        self.file = os.fdopen(fd, "wb")
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise HTTPException(status_code=413, detail=f"File exceeds {self.max_size} bytes")
+        self.sha256.update(data)
+        await run_in_threadpool(self.file.write, data)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def discard(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _PartEvents:
+    """Collects python-multipart callbacks so they can be handled with `await` afterwards."""
+
+    def __init__(self):
+        self.events = []
+        self.headers = {}
+        self._field = b""
+        self._value = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self.headers = {}
+
+    def on_header_field(self, data, start, end):
+        self._field += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self._value += data[start:end]
+
+    def on_header_end(self):
+        self.headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def on_headers_finished(self):
+        self.events.append(("headers", self.headers))
+
+    def on_part_data(self, data, start, end):
+        self.events.append(("data", bytes(data[start:end])))
+
+    def on_part_end(self):
+        self.events.append(("end", None))
+
+    def drain(self) -> list:
+        events, self.events = self.events, []
+        return events
+
+
+def _open_part(headers: dict) -> Optional[StreamedUpload]:
+    _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+    if disposition.get(b"name") != b"file":
+        return None
+
+    content_type = headers.get(b"content-type", b"application/octet-stream").decode("latin-1").lower()
+    if content_type not in UPLOAD_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {content_type}")
+    kind, max_size = UPLOAD_TYPES[content_type]
+    filename = disposition.get(b"filename", b"").decode("utf-8", "replace")
+    return StreamedUpload(filename, content_type, kind, max_size)
+
+
+async def receive_upload(request: Request) -> StreamedUpload:
+    """Stream the `file` part of a multipart body to disk, enforcing the size limit as it arrives."""
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+    max_body = max(limit for _, limit in UPLOAD_TYPES.values()) + MULTIPART_OVERHEAD
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_body:
+        raise HTTPException(status_code=413, detail="Upload too large")
+
+    events = _PartEvents()
+    parser = MultipartParser(params[b"boundary"], events.callbacks())
+    upload = None
+    current = None
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_body:
+                raise HTTPException(status_code=413, detail="Upload too large")
+            parser.write(chunk)
+            for event, value in events.drain():
+                if event == "headers":
+                    current = _open_part(value) if upload is None else None
+                    upload = upload or current
+                elif event == "data" and current is not None:
+                    await current.write(value)
+                elif event == "end":
+                    current = None
+        parser.finalize()
+    except BaseException:
+        if upload is not None:
+            upload.discard()
+        raise
+
+    if upload is None:
+        raise HTTPException(status_code=400, detail="Missing 'file' form field")
+    upload.close()
+    if upload.size == 0:
+        upload.discard()
+        raise HTTPException(status_code=400, detail="Empty file")
+    return upload
+
+
+async def resolve_asset(asset_id: str, kind: str) -> dict:
+    """Look up an uploaded asset referenced from a course payload."""
+    if not ObjectId.is_valid(asset_id):
+        raise HTTPException(status_code=400, detail="Invalid asset ID")
+    asset = await asset_collection.find_one({"_id": ObjectId(asset_id), "kind": kind})
+    if not asset:
+        raise HTTPException(status_code=400, detail=f"Unknown {kind} asset: {asset_id}")
+    return asset
@@ -0,0 +1,99 @@
+"""Per-course CPU cost of the response path: Pydantic + stdlib json vs. dict + orjson.
+
+    python -m benchmarks.bench_serialization [--courses 100] [--modules 8] [--lessons 10]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.routers.teacher_courses import course_to_dict, parse_course
+from app.services.serialization import dumps
+
+
+def make_course(modules: int, lessons: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "title": "Complete Python Bootcamp",
+        "description": "Master Python programming from scratch to advanced level. " * 4,
+        "category": "data",
+        "level": "Beginner",
+        "status": "published",
+        "thumbnail_image": "/static/ab/cd/" + "0" * 64 + ".webp",
+        "created_at": now,
+        "updated_at": now,
+        "student_count": 150,
+        "modules": [
+            {
+                "id": str(ObjectId()),
+                "title": f"Module {m}",
+                "description": "What this module covers, in a sentence or two.",
+                "lessons": [
+                    {
+                        "id": str(ObjectId()),
+                        "title": f"Lesson {m}.{l}",
+                        "video_url": "https://example.com/video.mp4",
+                        "duration": "12:30",
+                        "resource_url": "https://example.com/resources.zip",
+                        "summary": "This lesson covers basic Python syntax and concepts. " * 3,
+                    }
+                    for l in range(lessons)
+                ],
+                "quiz": {
+                    "title": "Module Quiz",
+                    "questions": [
+                        {"question": "What is 2+2?", "options": ["3", "4", "5", "6"], "correct_answer": 1}
+                        for _ in range(5)
+                    ],
+                },
+            }
+            for m in range(modules)
+        ],
+    }
+
+
+def pydantic_path(docs):
+    # What the handlers did before: validate into CourseInDB, encode, stdlib json
+    return json.dumps(jsonable_encoder([parse_course(doc) for doc in docs])).encode()
+
+
+def fast_path(docs):
+    return dumps([course_to_dict(doc) for doc in docs])
+
+
+def measure(fn, docs, repeat: int) -> float:
+    fn(docs)  # warm-up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(docs)
+        best = min(best, time.perf_counter() - start)
+    return best / len(docs)
+
+
+def run(courses: int = 100, modules: int = 8, lessons: int = 10, repeat: int = 5) -> dict:
+    docs = [make_course(modules, lessons) for _ in range(courses)]
+    before = measure(pydantic_path, docs, repeat)
+    after = measure(fast_path, docs, repeat)
+    return {
+        "courses": courses,
+        "modules_per_course": modules,
+        "lessons_per_module": lessons,
+        "pydantic_us_per_course": round(before * 1e6, 1),
+        "orjson_us_per_course": round(after * 1e6, 1),
+        "speedup": round(before / after, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=100)
+    parser.add_argument("--modules", type=int, default=8)
+    parser.add_argument("--lessons", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.courses, args.modules, args.lessons, args.repeat), indent=2))
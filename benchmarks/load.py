@@ -0,0 +1,114 @@
+"""Scripted load scenarios against the full FastAPI app over an in-process ASGI transport."""
+import asyncio
+import itertools
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import httpx
+from bson import ObjectId
+
+from app.database import mongo
+from app.main import app
+from benchmarks.bench_serialization import make_course
+from benchmarks.micro import sample_thumbnail
+
+
+def percentile(samples, p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+async def run_scenario(client, make_request, total: int, concurrency: int) -> dict:
+    latencies = []
+    statuses = Counter()
+    counter = itertools.count()
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if i >= total:
+                return
+            start = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(n for status, n in statuses.items() if status >= 400),
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def seed(courses: int, profiles: int) -> dict:
+    db = mongo.get_database()
+    now = datetime.utcnow()
+    docs = []
+    for i in range(courses):
+        doc = make_course(modules=6, lessons=8)
+        doc["created_at"] = doc["updated_at"] = now - timedelta(seconds=i)
+        docs.append(doc)
+    await db.teacher_courses.insert_many(docs)
+    profile_docs = [{"_id": ObjectId(), "full_name": f"Teacher {i}", "email": f"t{i}@example.com"} for i in range(profiles)]
+    await db.profile.insert_many(profile_docs)
+    return {
+        "course_ids": [str(doc["_id"]) for doc in docs],
+        "profile_ids": [str(doc["_id"]) for doc in profile_docs],
+    }
+
+
+def course_payload(thumbnail: str) -> dict:
+    lesson = {
+        "title": "Lesson",
+        "video_url": "https://example.com/video.mp4",
+        "duration": "12:30",
+        "resource_url": "https://example.com/resources.zip",
+        "summary": "This lesson covers basic Python syntax and concepts.",
+    }
+    module = {"title": "Module", "description": "Module description", "lessons": [lesson] * 8}
+    return {
+        "title": "Benchmark course",
+        "description": "Created by the load benchmark",
+        "category": "data",
+        "modules": [module] * 6,
+        "thumbnail_image": thumbnail,
+    }
+
+
+async def run(requests: int = 200, concurrency: int = 20, signups: int = 20) -> dict:
+    async with app.router.lifespan_context(app):
+        data = await seed(courses=300, profiles=50)
+        course_ids, profile_ids = data["course_ids"], data["profile_ids"]
+        payload = course_payload(sample_thumbnail(1200, 800))
+
+        scenarios = {
+            "catalog_list": lambda c, i: c.get("/teacher_courses/", params={"limit": 20}),
+            "catalog_list_summary": lambda c, i: c.get("/teacher_courses/", params={"limit": 20, "view": "summary"}),
+            "course_detail": lambda c, i: c.get(f"/teacher_courses/{course_ids[i % len(course_ids)]}"),
+            "course_create": lambda c, i: c.post("/teacher_courses/", json=payload),
+            "profile_update": lambda c, i: c.put(
+                f"/profile/{profile_ids[i % len(profile_ids)]}", json={"bio": f"Updated bio {i}"}
+            ),
+            "signup_burst": lambda c, i: c.post(
+                "/register/user", json={"username": f"user{i}", "password": "s3cret-pass", "email": f"u{i}@example.com"}
+            ),
+        }
+        totals = {"course_create": max(1, requests // 10), "signup_burst": signups}
+
+        transport = httpx.ASGITransport(app=app)
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, make_request in scenarios.items():
+                results[name] = await run_scenario(client, make_request, totals.get(name, requests), concurrency)
+        return results
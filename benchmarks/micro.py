@@ -0,0 +1,51 @@
+"""Micro-benchmarks for the hot helpers: course serialization, thumbnails and bcrypt."""
+import base64
+import tempfile
+import time
+from io import BytesIO
+
+import bcrypt
+from PIL import Image
+
+from app.config import BCRYPT_ROUNDS
+from app.services.images import render_thumbnail
+from benchmarks import bench_serialization
+
+
+def timed(fn, repeat: int) -> dict:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "best_ms": round(samples[0] * 1000, 3),
+        "median_ms": round(samples[len(samples) // 2] * 1000, 3),
+    }
+
+
+def sample_thumbnail(width: int = 2400, height: int = 1600) -> str:
+    image = Image.effect_mandelbrot((width, height), (-2.0, -1.5, 1.0, 1.5), 100).convert("RGB")
+    buf = BytesIO()
+    image.save(buf, "PNG")
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+
+def run(repeat: int = 5) -> dict:
+    course = bench_serialization.make_course(modules=8, lessons=10)
+    thumbnail = sample_thumbnail()
+    upload_dir = tempfile.mkdtemp(prefix="bench-uploads-")
+    return {
+        "parse_course": timed(lambda: bench_serialization.parse_course(course), repeat * 20),
+        "course_to_json": timed(
+            lambda: bench_serialization.dumps(bench_serialization.course_to_dict(course)), repeat * 20
+        ),
+        "render_thumbnail": timed(lambda: render_thumbnail(thumbnail, upload_dir), repeat),
+        "bcrypt_hash": {
+            "rounds": BCRYPT_ROUNDS,
+            **timed(lambda: bcrypt.hashpw(b"correct horse battery staple", bcrypt.gensalt(BCRYPT_ROUNDS)), repeat),
+        },
+    }
@@ -0,0 +1,92 @@
+"""Run the benchmark suite and store the results as JSON.
+
+    pip install -r requirements.txt -r benchmarks/requirements.txt
+    python -m benchmarks.run                          # writes benchmarks/results/<commit>.json
+    python -m benchmarks.run --compare benchmarks/results/<other>.json
+
+The app runs against an in-memory Mongo stand-in (mongomock-motor), so numbers
+measure this codebase's CPU cost, not Atlas latency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: dict, previous: dict):
+    """Print per-metric changes; positive % means slower (or lower throughput)."""
+    # startup is a single flat group of metrics
+    current = {**current, "startup": {"cold_start": current.get("startup", {})}}
+    previous = {**previous, "startup": {"cold_start": previous.get("startup", {})}}
+    for section in ("startup", "load", "micro"):
+        for name, metrics in current.get(section, {}).items():
+            before = previous.get(section, {}).get(name, {})
+            for key, value in metrics.items():
+                old = before.get(key)
+                if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                    continue
+                change = (value - old) / old * 100
+                if key == "throughput_rps":
+                    change = -change
+                print(f"{section}.{name}.{key}: {old} -> {value} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and micro benchmarks for the course API")
+    parser.add_argument("--requests", type=int, default=200, help="requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--signups", type=int, default=20, help="requests in the signup burst")
+    parser.add_argument("--bcrypt-rounds", type=int, help="override BCRYPT_ROUNDS for this run")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to diff against")
+    parser.add_argument("--skip-load", action="store_true")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure the environment before importing the app
+    os.environ.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="bench-uploads-"))
+    if args.bcrypt_rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+    from benchmarks import standin
+    standin.install()
+    from benchmarks import load, micro, startup
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "startup": startup.run(),
+        "micro": micro.run(),
+    }
+    if not args.skip_load:
+        results["load"] = asyncio.run(load.run(args.requests, args.concurrency, args.signups))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""In-memory stand-in for the Atlas cluster, so the app can be benchmarked offline."""
+import mongomock.collection
+from mongomock_motor import AsyncMongoMockClient
+
+from app.database import mongo
+
+
+def _patch_bulk_update_sort():
+    # pymongo >= 4.9 passes `sort=` to the bulk builder for UpdateOne; mongomock doesn't know it
+    add_update = mongomock.collection.BulkOperationBuilder.add_update
+    if getattr(add_update, "_accepts_sort", False):
+        return
+
+    def patched(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    patched._accepts_sort = True
+    mongomock.collection.BulkOperationBuilder.add_update = patched
+
+
+def install() -> AsyncMongoMockClient:
+    """Point app.database.mongo at a fresh in-memory client."""
+    _patch_bulk_update_sort()
+    client = AsyncMongoMockClient()
+    mongo.use_client(client)
+    return client
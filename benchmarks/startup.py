@@ -0,0 +1,85 @@
+"""Cold-start measurement: time to import app.main and to run its startup, each in a fresh process.
+
+    python -m benchmarks.startup                         # report
+    python -m benchmarks.startup --max-import-ms 1500    # exit 1 on regression (for CI)
+
+Also fails if a module that should load lazily (e.g. Pillow) is pulled in by the import.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Must not be imported by the web workers themselves (see app/services/images.py)
+LAZY_MODULES = ["PIL"]
+
+
+def child():
+    import asyncio
+    import time
+
+    start = time.perf_counter()
+    from app.main import app
+    import_ms = (time.perf_counter() - start) * 1000
+    loaded = [name for name in LAZY_MODULES if name in sys.modules]
+
+    from benchmarks import standin
+    standin.install()
+
+    async def lifespan():
+        start = time.perf_counter()
+        async with app.router.lifespan_context(app):
+            return (time.perf_counter() - start) * 1000
+
+    startup_ms = asyncio.run(lifespan())
+    print(json.dumps({"import_ms": import_ms, "startup_ms": startup_ms, "eager_modules": loaded}))
+
+
+def run(repeat: int = 5) -> dict:
+    env = {**os.environ, "CHANGE_FEED_ENABLED": "0"}
+    env.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="bench-uploads-"))
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-m", "benchmarks.startup", "--child"],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        "repeat": repeat,
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "startup_ms": round(statistics.median(s["startup_ms"] for s in samples), 1),
+        "eager_modules": sorted({name for s in samples for name in s["eager_modules"]}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float)
+    parser.add_argument("--max-startup-ms", type=float)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    result = run(args.repeat)
+    print(json.dumps(result, indent=2))
+    failures = []
+    if result["eager_modules"]:
+        failures.append(f"eagerly imported: {', '.join(result['eager_modules'])}")
+    if args.max_import_ms is not None and result["import_ms"] > args.max_import_ms:
+        failures.append(f"import {result['import_ms']} ms > {args.max_import_ms} ms")
+    if args.max_startup_ms is not None and result["startup_ms"] > args.max_startup_ms:
+        failures.append(f"startup {result['startup_ms']} ms > {args.max_startup_ms} ms")
+    if failures:
+        print("Startup regression: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,2 @@
 
- python -m uvicorn app.main:app --reload
\ No newline at end of file
+python -m app.serve
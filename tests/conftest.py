@@ -0,0 +1,47 @@
+# Tests run the full app against the in-memory Mongo stand-in from benchmarks/standin.py
+#   pip install -r requirements.txt -r benchmarks/requirements.txt pytest
+#   python -m pytest -q
+import os
+import tempfile
+
+# Settings are read at import time
+os.environ.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="test-uploads-"))
+os.environ.setdefault("UPLOAD_TMP_DIR", tempfile.mkdtemp(prefix="test-upload-tmp-"))
+os.environ.setdefault("CHANGE_FEED_ENABLED", "0")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Only used by live_client, and dropped afterwards
+os.environ.setdefault("MONGODB_DB_NAME", "platform_backend_tests")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks import standin
+
+
+@pytest.fixture
+def client():
+    standin.install()
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def live_client():
+    """Like `client`, against the real server at MONGODB_TEST_URI (for $text, pipelines etc.)."""
+    uri = os.getenv("MONGODB_TEST_URI")
+    if not uri:
+        pytest.skip("MONGODB_TEST_URI not set")
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from app.config import MONGODB_DB_NAME
+    from app.database import mongo
+    from app.main import app
+
+    mongo.use_client(AsyncIOMotorClient(uri))
+    with TestClient(app) as test_client:
+        try:
+            yield test_client
+        finally:
+            test_client.portal.call(mongo.get_client().drop_database, MONGODB_DB_NAME)
@@ -0,0 +1,45 @@
+import base64
+import json
+import os
+
+from benchmarks.micro import sample_thumbnail
+from app.config import UPLOAD_DIR
+from app.database import mongo
+from app.services.storage import STATIC_PREFIX, blob_digest
+
+
+def blob_refs(client, url):
+    blob = client.portal.call(mongo.get_database().blobs.find_one, {"_id": blob_digest(url)})
+    return blob["refs"] if blob else 0
+
+
+def test_import_counts_one_ref_per_course_sharing_a_thumbnail(client):
+    thumbnail = sample_thumbnail(320, 200)
+    lines = [json.dumps({"title": f"Course {i}", "description": "d", "thumbnail_image": thumbnail}) for i in range(4)]
+    report = client.post("/teacher_courses/import", content="\n".join(lines)).json()
+    assert report["created"] == 4
+    ids = [result["id"] for result in report["results"]]
+
+    url = client.get(f"/teacher_courses/{ids[0]}").json()["thumbnail_image"]
+    assert blob_refs(client, url) == 4
+
+    assert client.delete(f"/teacher_courses/{ids[0]}").status_code == 200
+    assert blob_refs(client, url) == 3
+    assert os.path.exists(os.path.join(UPLOAD_DIR, url[len(STATIC_PREFIX):]))
+
+
+def test_asset_holds_a_ref_until_deleted(client):
+    png = base64.b64decode(sample_thumbnail(320, 200).split(",", 1)[-1])
+    asset = client.post("/assets/", files={"file": ("t.png", png, "image/png")}).json()
+    course = client.post(
+        "/teacher_courses/", json={"title": "C", "description": "d", "thumbnail_asset_id": asset["id"]}
+    ).json()
+    assert blob_refs(client, asset["url"]) == 2
+
+    assert client.delete(f"/teacher_courses/{course['id']}").status_code == 200
+    assert blob_refs(client, asset["url"]) == 1
+    assert os.path.exists(os.path.join(UPLOAD_DIR, asset["url"][len(STATIC_PREFIX):]))
+
+    assert client.delete(f"/assets/{asset['id']}").status_code == 200
+    assert blob_refs(client, asset["url"]) == 0
+    assert not os.path.exists(os.path.join(UPLOAD_DIR, asset["url"][len(STATIC_PREFIX):]))
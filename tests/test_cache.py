@@ -0,0 +1,13 @@
+import pytest
+
+from app.services.cache import CacheBackend, LRUCache
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class GetOnly(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+    assert LRUCache(max_entries=1, ttl=1).stats()["entries"] == 0
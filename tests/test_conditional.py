@@ -0,0 +1,55 @@
+import pytest
+
+from app.services import compression
+
+
+def create_course(client, description="d"):
+    return client.post("/teacher_courses/", json={"title": "C", "description": description}).json()["id"]
+
+
+def test_course_read_revalidates_with_etag(client):
+    course_id = create_course(client)
+    first = client.get(f"/teacher_courses/{course_id}", headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+
+    not_modified = client.get(f"/teacher_courses/{course_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    # Compressed responses hand out the weak form; it must revalidate too
+    assert client.get(f"/teacher_courses/{course_id}", headers={"If-None-Match": "W/" + etag}).status_code == 304
+
+    client.put(f"/teacher_courses/{course_id}", json={"title": "Renamed", "description": "d"})
+    changed = client.get(f"/teacher_courses/{course_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["title"] == "Renamed"
+
+
+def test_large_bodies_are_gzipped_with_a_weak_etag(client):
+    course_id = create_course(client, description="x" * 4000)
+    response = client.get(f"/teacher_courses/{course_id}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert response.headers["etag"].startswith("W/")
+    assert response.json()["description"] == "x" * 4000
+
+
+def test_small_or_refused_bodies_are_sent_as_is(client):
+    small = create_course(client)
+    assert "content-encoding" not in client.get(f"/teacher_courses/{small}", headers={"Accept-Encoding": "gzip"}).headers
+
+    large = create_course(client, description="x" * 4000)
+    refused = client.get(f"/teacher_courses/{large}", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in refused.headers
+
+
+def test_brotli_only_used_when_installed(client, monkeypatch):
+    course_id = create_course(client, description="x" * 4000)
+    headers = {"Accept-Encoding": "br, gzip"}
+
+    monkeypatch.setattr(compression, "brotli", None)
+    assert client.get(f"/teacher_courses/{course_id}", headers=headers).headers["content-encoding"] == "gzip"
+
+    monkeypatch.undo()
+    if compression.brotli is None:
+        pytest.skip("brotli not installed")
+    assert client.get(f"/teacher_courses/{course_id}", headers=headers).headers["content-encoding"] == "br"
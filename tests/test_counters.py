@@ -0,0 +1,25 @@
+import asyncio
+
+from app.services.counters import WriteBehindCounter
+
+
+class StalledCollection:
+    name = "stalled"
+
+    async def bulk_write(self, ops, ordered=True):
+        await asyncio.Event().wait()
+
+
+def test_cancelled_flush_keeps_pending_increments():
+    counter = WriteBehindCounter(StalledCollection(), "student_count", interval=60)
+
+    async def cancel_mid_flush():
+        counter.add("a", 2)
+        counter.add("b")
+        task = asyncio.create_task(counter.flush())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(cancel_mid_flush())
+    assert counter.stats()["pending_increments"] == 3
@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "method, path",
+    [
+        ("post", "/teacher_courses/not-an-id/modules"),
+        ("patch", "/teacher_courses/not-an-id/modules/m1"),
+        ("delete", "/teacher_courses/not-an-id/modules/m1"),
+        ("put", "/teacher_courses/not-an-id/modules/order"),
+        ("delete", "/teacher_courses/not-an-id/modules/m1/lessons/l1"),
+        ("delete", "/teacher_courses/not-an-id/modules/m1/quiz"),
+    ],
+)
+def test_granular_edits_reject_malformed_course_ids(client, method, path):
+    body = {
+        "post": {"title": "M", "description": "d"},
+        "patch": {"title": "M"},
+        "put": {"ids": ["m1"]},
+    }.get(method)
+    response = client.request(method.upper(), path, json=body)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid course ID"
@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+
+from app.routers.teacher_courses import EXPORT_CSV_HEADER
+
+LESSON = {"title": "L", "video_url": "v", "duration": "1:00", "resource_url": "r", "summary": "s"}
+
+
+def create_courses(client):
+    with_lessons = {"title": "A", "description": "d", "modules": [
+        {"title": "M1", "description": "d", "lessons": [LESSON, {**LESSON, "title": "L2"}]},
+        {"title": "M2", "description": "d", "lessons": []},
+    ]}
+    bare = {"title": "B", "description": "d"}
+    return [client.post("/teacher_courses/", json=body).json()["id"] for body in (with_lessons, bare)]
+
+
+def test_ndjson_has_one_course_per_line(client):
+    ids = create_courses(client)
+    response = client.get("/teacher_courses/export")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-export-watermark"]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == ids
+    assert [module["title"] for module in lines[0]["modules"]] == ["M1", "M2"]
+
+
+def test_csv_has_one_row_per_lesson(client):
+    a, b = create_courses(client)
+    rows = list(csv.reader(io.StringIO(client.get("/teacher_courses/export", params={"format": "csv"}).text)))
+    assert rows[0] == EXPORT_CSV_HEADER
+    column = {name: index for index, name in enumerate(EXPORT_CSV_HEADER)}
+    shape = [(row[column["course_id"]], row[column["module_title"]], row[column["lesson_title"]]) for row in rows[1:]]
+    # Lessons, then a row for the module without lessons, then one for the course without modules
+    assert shape == [(a, "M1", "L"), (a, "M1", "L2"), (a, "M2", ""), (b, "", "")]
+
+
+def test_since_watermark_picks_up_only_later_changes(client):
+    create_courses(client)
+    watermark = client.get("/teacher_courses/export").headers["x-export-watermark"]
+    later = client.post("/teacher_courses/", json={"title": "C", "description": "d"}).json()["id"]
+    lines = client.get("/teacher_courses/export", params={"since": watermark}).text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [later]
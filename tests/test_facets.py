@@ -0,0 +1,16 @@
+from app.services.facets import catalog_facets
+
+
+def test_incremental_counts_match_a_recompute(client):
+    for category in ["", "Math", None]:
+        body = {"title": "C", "description": "d"}
+        if category is not None:
+            body["category"] = category
+        assert client.post("/teacher_courses/", json=body).status_code == 200
+    incremental = client.get("/teacher_courses/facets").json()
+    assert incremental["category"] == {"": 1, "Math": 1, "General": 1}
+
+    client.portal.call(catalog_facets.recompute)
+    recomputed = client.get("/teacher_courses/facets").json()
+    assert recomputed["category"] == incremental["category"]
+    assert recomputed["total"] == incremental["total"] == 3
@@ -0,0 +1,30 @@
+import json
+
+
+def test_import_reports_each_bad_line_and_keeps_the_rest(client):
+    body = "\n".join([
+        json.dumps({"title": "A", "description": "d"}),
+        "",
+        "{not json",
+        json.dumps({"description": "no title"}),
+        json.dumps({"title": "B", "description": "d", "thumbnail_image": "data:image/png;base64,AAAA"}),
+        json.dumps({"title": "C", "description": "d"}),
+    ])
+    report = client.post("/teacher_courses/import", content=body).json()
+
+    assert (report["created"], report["failed"]) == (2, 3)
+    statuses = [(result["line"], result["status"]) for result in report["results"]]
+    assert statuses == [(1, "created"), (3, "error"), (4, "error"), (5, "error"), (6, "created")]
+    assert all(result["error"] for result in report["results"] if result["status"] == "error")
+
+    created = {result["id"] for result in report["results"] if result["status"] == "created"}
+    listed = {item["id"] for item in client.get("/teacher_courses/").json()["items"]}
+    assert listed == created
+
+
+def test_oversized_line_is_rejected(client, monkeypatch):
+    from app.routers import teacher_courses
+
+    monkeypatch.setattr(teacher_courses, "IMPORT_MAX_LINE_BYTES", 64)
+    line = json.dumps({"title": "A", "description": "x" * 200})
+    assert client.post("/teacher_courses/import", content=line + "\n").status_code == 413
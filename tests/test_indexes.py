@@ -0,0 +1,13 @@
+import pytest
+
+from app.database import mongo
+from app.database.indexes import ensure_indexes
+
+
+def test_startup_fails_when_a_unique_index_cannot_be_built(client):
+    db = mongo.get_database()
+    client.portal.call(db.users.drop_index, "username_unique")
+    client.portal.call(db.users.insert_many, [{"username": "dup"}, {"username": "dup"}])
+
+    with pytest.raises(RuntimeError, match="username_unique"):
+        client.portal.call(ensure_indexes, db)
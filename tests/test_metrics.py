@@ -0,0 +1,16 @@
+def test_in_flight_gauge_is_labelled_by_route_template(client):
+    body = client.get("/metrics").text
+    # The scrape itself is the one request in flight
+    assert 'http_requests_in_flight{route="/metrics"} 1' in body
+
+    client.get("/teacher_courses/0123456789abcdef01234567")
+    body = client.get("/metrics").text
+    assert 'http_requests_in_flight{route="/teacher_courses/{course_id}"} 0' in body
+
+
+def test_route_label_ignores_ids_that_share_a_prefix(client):
+    course_id = "0123456789abcdef01234560"
+    client.patch(f"/teacher_courses/{course_id}/modules/{course_id}x", json={"title": "T"})
+    body = client.get("/metrics").text
+    assert course_id not in body
+    assert 'route="/teacher_courses/{course_id}/modules/{module_id}"' in body
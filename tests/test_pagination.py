@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.database import mongo
+
+
+def insert_courses(client, count):
+    # Pairs share created_at so pages have to break ties on _id
+    start = datetime(2024, 1, 1)
+    docs = [
+        {
+            "_id": ObjectId(),
+            "title": f"Course {i}",
+            "description": "d",
+            "created_at": start + timedelta(minutes=i // 2),
+            "updated_at": start,
+            "student_count": 0,
+            "modules": [{"id": "m", "title": "M", "description": "d", "lessons": []}],
+        }
+        for i in range(count)
+    ]
+    client.portal.call(mongo.get_database().teacher_courses.insert_many, docs)
+    return docs
+
+
+def test_cursor_pages_cover_every_course_once_in_order(client):
+    docs = insert_courses(client, 7)
+    expected = [str(doc["_id"]) for doc in sorted(docs, key=lambda d: (d["created_at"], d["_id"]), reverse=True)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/teacher_courses/", params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_summary_view_leaves_out_the_curriculum(client):
+    insert_courses(client, 1)
+    item = client.get("/teacher_courses/", params={"view": "summary"}).json()["items"][0]
+    assert item["title"] == "Course 0"
+    assert "modules" not in item
+
+
+def test_malformed_cursor_is_rejected(client):
+    assert client.get("/teacher_courses/", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,15 @@
+import asyncio
+
+from app.services.passwords import PasswordHasher
+
+
+def test_hasher_works_again_after_shutdown():
+    hasher = PasswordHasher(rounds=4, max_workers=1, queue_limit=1)
+
+    async def roundtrip():
+        return await hasher.verify("secret", await hasher.hash("secret"))
+
+    assert asyncio.run(roundtrip())
+    hasher.shutdown()
+    assert asyncio.run(roundtrip())
+    hasher.shutdown()
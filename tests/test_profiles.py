@@ -0,0 +1,29 @@
+from app.database import mongo
+
+
+def test_noop_profile_update_writes_nothing(client):
+    profile = client.post("/profile/", json={"full_name": "A", "email": "a@example.com"}).json()
+    stored = client.portal.call(mongo.get_database().profile.find_one, {})
+
+    response = client.put(f"/profile/{profile['id']}", json={"full_name": "A"})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Profile not modified"
+    assert client.portal.call(mongo.get_database().profile.find_one, {})["updated_at"] == stored["updated_at"]
+
+    response = client.put(f"/profile/{profile['id']}", json={"full_name": "B"})
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "B"
+
+
+def test_profile_etag_follows_updated_at(client):
+    profile = client.post("/profile/", json={"full_name": "A", "email": "a@example.com"}).json()
+    first = client.get(f"/profile/{profile['id']}")
+    assert first.json()["full_name"] == "A"
+    etag = first.headers["etag"]
+
+    assert client.get(f"/profile/{profile['id']}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/profile/{profile['id']}", json={"full_name": "B"})
+    changed = client.get(f"/profile/{profile['id']}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
@@ -0,0 +1,33 @@
+QUIZ = {
+    "title": "Check",
+    "questions": [
+        {"question": "1 + 1", "options": ["1", "2"], "correct_answer": 1},
+        {"question": "2 + 2", "options": ["4", "5"], "correct_answer": 0},
+    ],
+}
+MODULE = {"title": "M", "description": "d", "lessons": [], "quiz": QUIZ}
+
+
+def grade(client, course_id, module_id, answers):
+    response = client.post(
+        f"/teacher_courses/{course_id}/modules/{module_id}/quiz/submissions",
+        json={"submissions": [{"student_id": "s1", "answers": answers}]},
+    )
+    return response.json()["results"][0]["score"]
+
+
+def test_course_read_back_without_answer_keys_saves_unchanged(client):
+    course = client.post("/teacher_courses/", json={"title": "C", "description": "d", "modules": [MODULE]}).json()
+    read = client.get(f"/teacher_courses/{course['id']}").json()
+    assert "correct_answer" not in read["modules"][0]["quiz"]["questions"][0]
+
+    read["title"] = "Renamed"
+    assert client.put(f"/teacher_courses/{course['id']}", json=read).status_code == 200
+    assert grade(client, course["id"], read["modules"][0]["id"], [1, 0]) == 2
+
+
+def test_new_question_without_answer_key_is_rejected(client):
+    course = client.post("/teacher_courses/", json={"title": "C", "description": "d", "modules": [MODULE]}).json()
+    read = client.get(f"/teacher_courses/{course['id']}").json()
+    read["modules"][0]["quiz"]["questions"].append({"question": "3 + 3", "options": ["6"]})
+    assert client.put(f"/teacher_courses/{course['id']}", json=read).status_code == 422
@@ -0,0 +1,39 @@
+import copy
+import os
+
+import pytest
+from bson import ObjectId
+
+from app.services.rollups import ROLLUP_REFRESH, apply_rollups
+
+# mongomock can't evaluate the refresh pipeline; point this at a scratch database to run it
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI")
+
+MODULES = [
+    {"id": "a", "lessons": [{"duration": d} for d in ["10:05", "1:00:00", "5", "5\n", "", "abc", " 5", "+5", "-5", "5.5"]]},
+    {"id": "b", "lessons": [{"duration": d} for d in [None, 300, 5.0, "٣", "1234567890", "00:00:07", "1::2"]]},
+    {"id": "c", "lessons": [{}], "quiz": {}},
+    {"id": "d", "quiz": None},
+    {"id": "e", "lessons": [], "quiz": {"title": "Q", "questions": []}},
+    {"id": "f"},
+]
+
+
+@pytest.mark.skipif(not MONGODB_TEST_URI, reason="MONGODB_TEST_URI not set")
+def test_pipeline_rollups_match_python_rollups():
+    from pymongo import MongoClient
+
+    client = MongoClient(MONGODB_TEST_URI)
+    collection = client.get_database("rollup_tests")[f"courses_{ObjectId()}"]
+    try:
+        collection.insert_one({"_id": 1, "modules": copy.deepcopy(MODULES)})
+        collection.update_one({"_id": 1}, ROLLUP_REFRESH)
+        stored = collection.find_one({"_id": 1})
+
+        expected = copy.deepcopy(MODULES)
+        course_rollup = apply_rollups(expected)
+        assert stored["rollup"] == course_rollup
+        assert [m["rollup"] for m in stored["modules"]] == [m["rollup"] for m in expected]
+    finally:
+        collection.drop()
+        client.close()
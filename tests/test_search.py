@@ -0,0 +1,27 @@
+def create(client, title, description):
+    return client.post("/teacher_courses/", json={"title": title, "description": description}).json()["id"]
+
+
+def test_title_matches_rank_above_description_matches(live_client):
+    in_description = create(live_client, "Data analysis", "Hands-on python exercises")
+    in_title = create(live_client, "Python basics", "An introduction")
+    create(live_client, "Watercolour", "Painting for beginners")
+
+    items = live_client.get("/teacher_courses/search", params={"q": "python"}).json()["items"]
+    assert [item["id"] for item in items] == [in_title, in_description]
+    assert items[0]["score"] > items[1]["score"]
+
+
+def test_search_pages_continue_by_score(live_client):
+    ids = {create(live_client, f"Python {i}", "python " * i) for i in range(1, 4)}
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "python", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        page = live_client.get("/teacher_courses/search", params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(ids)
+    assert len(seen) == len(ids)
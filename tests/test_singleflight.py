@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.cache import document_cache
+from app.services.singleflight import SingleFlight
+
+
+class SlowQuery:
+    def __init__(self, result=b"body", error=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_identical_reads_share_one_query():
+    async def scenario():
+        flight, query = SingleFlight("test"), SlowQuery()
+        waiters = [asyncio.ensure_future(flight.do("k", query)) for _ in range(5)]
+        other = asyncio.ensure_future(flight.do("other", query))
+        await asyncio.sleep(0)
+        query.release.set()
+        assert await asyncio.gather(*waiters) == [b"body"] * 5
+        await other
+        return query.calls
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_errors_reach_every_waiter():
+    async def scenario():
+        flight, query = SingleFlight("test"), SlowQuery(error=ValueError("boom"))
+        waiters = [asyncio.ensure_future(flight.do("k", query)) for _ in range(3)]
+        await asyncio.sleep(0)
+        query.release.set()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(scenario()))
+
+
+def test_a_disconnecting_waiter_does_not_cancel_the_shared_query():
+    async def scenario():
+        flight, query = SingleFlight("test"), SlowQuery()
+        leaving = asyncio.ensure_future(flight.do("k", query))
+        staying = asyncio.ensure_future(flight.do("k", query))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        query.release.set()
+        return await staying
+
+    assert asyncio.run(scenario()) == b"body"
+
+
+def test_reads_after_a_write_start_a_fresh_query():
+    async def scenario():
+        flight, query = SingleFlight("test"), SlowQuery()
+        before = asyncio.ensure_future(flight.do("k", query))
+        await asyncio.sleep(0)
+        await document_cache.invalidate("teacher_courses", "some-id")
+        after = asyncio.ensure_future(flight.do("k", query))
+        await asyncio.sleep(0)
+        query.release.set()
+        await asyncio.gather(before, after)
+        return query.calls
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_timeouts_become_504():
+    async def scenario():
+        await SingleFlight("test", timeout=0.01).do("k", SlowQuery())
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 504